@@ -1,22 +1,722 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, has_app_context, has_request_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 import sqlite3
-from datetime import datetime
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+import base64
+import bisect
+import csv
+import functools
+import io
+import json
 import os
+import queue
+import re
+import threading
+import time
+import zlib
+from werkzeug.http import http_date
 from werkzeug.security import generate_password_hash, check_password_hash
 
+try:
+    import brotli
+except ImportError:  # Brotli is optional; responses fall back to gzip
+    brotli = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; responses fall back to the stdlib encoder
+    orjson = None
+
+# ==================== JSON PROVIDER ====================
+
+def json_default(o):
+    """
+    Encode the non-JSON types the views return: rows, Decimals and dates.
+    Dates and datetimes become HTTP dates, as with Flask's default provider.
+    """
+    if isinstance(o, sqlite3.Row):
+        return dict(o)
+    if isinstance(o, Decimal):
+        return str(o)  # exact; float() could round a price
+    if isinstance(o, date):
+        return http_date(o)
+    raise TypeError(f'Object of type {type(o).__name__} is not JSON serializable')
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """
+    Flask's default provider, with the same type handling as OrjsonProvider.
+    Used when orjson is not installed, so values encode the same either way.
+    """
+    default = staticmethod(json_default)
+
+class OrjsonProvider(StdlibJSONProvider):
+    """
+    JSON provider backed by orjson. Keys are sorted and output is compact (or
+    indented in debug mode) like the default provider; non-ASCII text is sent
+    as UTF-8 rather than \\u escapes. Dates and datetimes are passed through
+    to json_default, so they are HTTP dates as on the stdlib provider, not
+    orjson's RFC 3339. Calls with stdlib-only keyword arguments fall back to
+    the stdlib encoder.
+    """
+    def _options(self):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if self.compact is False or (self.compact is None and self._app.debug):
+            options |= orjson.OPT_INDENT_2
+        return options
+    
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=json_default, option=self._options()).decode()
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=json_default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+JSON_PROVIDERS = {'stdlib': StdlibJSONProvider}
+if orjson:
+    JSON_PROVIDERS['orjson'] = OrjsonProvider
+JSON_PROVIDER = os.environ.get('JSON_PROVIDER', 'orjson' if orjson else 'stdlib')
+
 app = Flask(__name__)
+app.json = JSON_PROVIDERS[JSON_PROVIDER](app)
 CORS(app)  # Enable CORS for all routes
 
 # Database configuration
 DATABASE = 'restaurant.db'
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+
+# Response compression (negotiated from Accept-Encoding)
+COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))  # bytes
+COMPRESS_GZIP_LEVEL = int(os.environ.get('COMPRESS_GZIP_LEVEL', 6))  # 1-9
+COMPRESS_BROTLI_LEVEL = int(os.environ.get('COMPRESS_BROTLI_LEVEL', 4))  # 0-11
+COMPRESS_CHUNK_SIZE = 64 * 1024
+COMPRESS_MIMETYPES = {'application/json'}
+# In server preference order; a client's q-values still take priority
+CONTENT_CODINGS = ['br', 'gzip'] if brotli else ['gzip']
+
+# Histogram bucket upper bounds for /api/metrics
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)  # bytes
+
+# Secondary indexes for hot lookups, created idempotently by init_database().
+# order_item lookups by OrderID are served by its (OrderID, ItemID) primary key.
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_bill_order ON bill (OrderID)',
+    'CREATE INDEX IF NOT EXISTS idx_review_created_at ON review (created_at)',
+    'CREATE INDEX IF NOT EXISTS idx_orders_emp ON orders (EmpID)',
+    'CREATE INDEX IF NOT EXISTS idx_table_capacity ON restaurant_table (capacity, price)',
+    'CREATE INDEX IF NOT EXISTS idx_reservation_table_start ON reservation (TableID, start_time)',
+]
+
+# Reservations hold a table from start_time up to (not including) end_time,
+# both stored as SLOT_FORMAT text so they compare in time order.
+# A booking with a start but no end time lasts its table's turn_minutes;
+# tables get the default for their category when created.
+SLOT_FORMAT = '%Y-%m-%d %H:%M'
+TURN_MINUTES = {'Standard': 90, 'Premium': 120, 'VIP': 150, 'Family': 120}
+DEFAULT_TURN_MINUTES = 90
+# Longest booking accepted (a date-only booking holds the table all day).
+# The overlap checks rely on it: a booking still running at some time t
+# started less than this long before t.
+MAX_RESERVATION_MINUTES = 24 * 60
+
+# Bookings on a table that overlap [start, end): params are (table id,
+# start - MAX_RESERVATION_MINUTES, end, start). The lower bound on start_time
+# turns the overlap test into one idx_reservation_table_start range scan.
+RESERVATION_OVERLAP_QUERY = '''
+    SELECT ReservationID FROM reservation
+    WHERE TableID = ? AND start_time > ? AND start_time < ? AND end_time > ?
+    LIMIT 1
+'''
+
+# Tables that seat a party and have no booking overlapping a day, best fit
+# first: params are (party size, day start - MAX_RESERVATION_MINUTES, next day
+# start, day start), the same day window as TABLE_STATUS_QUERY. An anti-join
+# probing idx_reservation_table_start once per table, with tables read in
+# idx_table_capacity order so no sort is needed
+AVAILABLE_TABLES_QUERY = '''
+    SELECT t.TableID, t.category, t.price, t.capacity
+    FROM restaurant_table t
+    WHERE t.capacity >= ?
+      AND NOT EXISTS (
+          SELECT 1 FROM reservation r
+          WHERE r.TableID = t.TableID AND r.start_time > ? AND r.start_time < ? AND r.end_time > ?
+      )
+    ORDER BY t.capacity, t.price, t.TableID
+'''
+
+# Every table with its first booking overlapping a day: params are
+# (day start - MAX_RESERVATION_MINUTES, next day start, day start)
+TABLE_STATUS_QUERY = '''
+    SELECT
+        t.TableID,
+        t.category,
+        t.price,
+        t.capacity,
+        r.ReservationID,
+        r.CustomerID,
+        c.CustomerName
+    FROM restaurant_table t
+    LEFT JOIN reservation r ON r.ReservationID = (
+        SELECT ReservationID FROM reservation
+        WHERE TableID = t.TableID AND start_time > ? AND start_time < ? AND end_time > ?
+        ORDER BY start_time
+        LIMIT 1
+    )
+    LEFT JOIN customer c ON r.CustomerID = c.CustomerID
+    ORDER BY t.TableID
+'''
+
+# Same, for a sitting starting at a time and lasting each table's turn_minutes:
+# params are (party size, start - MAX_RESERVATION_MINUTES, start, start)
+AVAILABLE_AT_QUERY = '''
+    SELECT t.TableID, t.category, t.price, t.capacity, t.turn_minutes
+    FROM restaurant_table t
+    WHERE t.capacity >= ?
+      AND NOT EXISTS (
+          SELECT 1 FROM reservation r
+          WHERE r.TableID = t.TableID
+            AND r.start_time > ?
+            AND r.start_time < strftime('%Y-%m-%d %H:%M', ?, '+' || t.turn_minutes || ' minutes')
+            AND r.end_time > ?
+      )
+    ORDER BY t.capacity, t.price, t.TableID
+'''
+
+# Hot queries whose plans are checked at startup; each must avoid a full table scan
+HOT_QUERIES = {
+    'order items by order': ('SELECT ItemID, quantity FROM order_item WHERE OrderID = ?', (1,)),
+    'bill by order': ('SELECT billID FROM bill WHERE OrderID = ?', (1,)),
+    'reservation conflict': (
+        RESERVATION_OVERLAP_QUERY,
+        (1, '2024-12-31 19:00', '2025-01-01 21:00', '2025-01-01 19:00')
+    ),
+    'recent reviews': ("SELECT COUNT(*) FROM review WHERE created_at >= datetime('now', '-7 days')", ()),
+    'reviews newest first': ('SELECT ReviewID FROM review ORDER BY created_at DESC, ReviewID DESC LIMIT ?', (10,)),
+    'orders by employee': ('SELECT OrderID FROM orders WHERE EmpID = ?', (1,)),
+    'available tables': (
+        AVAILABLE_TABLES_QUERY,
+        (2, '2024-12-31 00:00', '2025-01-02 00:00', '2025-01-01 00:00')
+    ),
+    'available tables at a time': (
+        AVAILABLE_AT_QUERY,
+        (2, '2024-12-31 19:00', '2025-01-01 19:00', '2025-01-01 19:00')
+    ),
+}
+
+# Tables whose writes bump a row in table_version (via triggers), so caches and
+# ETags in every worker process can tell when their data is stale
+VERSIONED_TABLES = ['menu', 'restaurant_table', 'reservation', 'review']
+
+# Rows per transaction in a reservation import; the write lock is released
+# between chunks, so API bookings are not held up for a whole file
+IMPORT_CHUNK_SIZE = int(os.environ.get('IMPORT_CHUNK_SIZE', 500))
+# Rejected rows listed in a POST /api/reservations/import response
+IMPORT_MAX_REPORTED_ERRORS = 1000
+
+# Largest POST /api/orders/batch request accepted
+ORDER_BATCH_MAX_ORDERS = int(os.environ.get('ORDER_BATCH_MAX_ORDERS', 1000))
+
+# Keyset pagination for list endpoints (?limit=&after=)
+DEFAULT_PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+# SQLite runtime profiles, applied once when a pooled connection is opened.
+# All use WAL so readers do not block behind a writer; busy_timeout makes
+# concurrent writers wait for the lock instead of failing with "database is locked".
+SQLITE_PROFILES = {
+    # fsync on every commit, small memory footprint
+    'safe': {
+        'busy_timeout': 10000,
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -8000,  # KiB
+        'mmap_size': 0,
+        'temp_store': 'DEFAULT',
+    },
+    # survives application crashes; a power loss may drop the last few commits
+    'balanced': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -32000,
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+    # no fsync: fastest writes, but a power or OS failure can lose recent commits
+    'throughput': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'cache_size': -128000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+DB_PROFILE = os.environ.get('DB_PROFILE', 'balanced')
+
+# SQL instrumentation: statements slower than SLOW_QUERY_MS are logged, and a
+# read (SELECT) shape run more than N_PLUS_ONE_THRESHOLD times in one request
+# is reported as a likely N+1 query. Repeated writes are left out: batch
+# endpoints insert row by row on purpose, to get each generated id.
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', 100))
+N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', 20))
+
+# ==================== SQL INSTRUMENTATION ====================
+
+SQL_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+SQL_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+
+@functools.lru_cache(maxsize=512)
+def statement_shape(sql):
+    """Normalize a statement for grouping and logging: literals become ?, whitespace is collapsed"""
+    shape = SQL_LITERAL.sub('?', ' '.join(sql.split()))
+    return SQL_PLACEHOLDER_LIST.sub('(?, ...)', shape)
+
+def redact_params(parameters, many=False):
+    """Describe bound parameters by type only, so no values reach the log"""
+    if many:
+        return f'{sum(1 for _ in parameters)} rows' if isinstance(parameters, (list, tuple)) else 'rows'
+    if isinstance(parameters, dict):
+        return '{' + ', '.join(f'{key}: {type(value).__name__}' for key, value in parameters.items()) + '}'
+    return '(' + ', '.join(type(value).__name__ for value in parameters) + ')'
+
+class QueryStats:
+    """Statements run during one request: count, total time and count per shape"""
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = {}
+
+def record_query(sql, parameters, seconds, many=False, executed_seconds=None):
+    """
+    Account one statement to the current request and log it once its total
+    time crosses SLOW_QUERY_MS. For the fetch that follows an execute,
+    executed_seconds is the time already recorded for the execute.
+    """
+    if has_request_context():
+        stats = g.get('query_stats')
+        if stats is None:
+            stats = g.query_stats = QueryStats()
+        stats.seconds += seconds
+        if executed_seconds is None:
+            stats.count += 1
+            shape = statement_shape(sql)
+            stats.shapes[shape] = stats.shapes.get(shape, 0) + 1
+    
+    if executed_seconds is None:
+        total_ms, logged = seconds * 1000, False
+    else:
+        total_ms = (executed_seconds + seconds) * 1000
+        logged = executed_seconds * 1000 >= SLOW_QUERY_MS  # already reported by the execute
+    if total_ms >= SLOW_QUERY_MS and not logged:
+        app.logger.warning('Slow query (%.1f ms): %s params=%s',
+                           total_ms, statement_shape(sql), redact_params(parameters, many))
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor returned by PooledConnection.execute(); fetchall() time counts toward its statement"""
+    statement = None  # (sql, parameters, seconds spent in execute)
+    
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        if self.statement:
+            sql, parameters, seconds = self.statement
+            record_query(sql, parameters, time.perf_counter() - started, executed_seconds=seconds)
+        return rows
+
+@app.after_request
+def add_query_headers(response):
+    """In debug mode, report the request's statement count and SQL time"""
+    stats = g.get('query_stats')
+    if app.debug and stats:
+        response.headers['X-Query-Count'] = str(stats.count)
+        response.headers['X-Query-Time-Ms'] = f'{stats.seconds * 1000:.1f}'
+    return response
+
+@app.teardown_request
+def report_repeated_queries(exception=None):
+    """Warn about read shapes repeated often enough to suggest an N+1 query"""
+    stats = g.pop('query_stats', None)
+    if stats is None:
+        return
+    for shape, count in stats.shapes.items():
+        if count > N_PLUS_ONE_THRESHOLD and shape.startswith(('SELECT', 'WITH')):
+            app.logger.warning('Likely N+1 query in %s %s: ran %d times: %s',
+                               request.method, request.path, count, shape)
+
+# ==================== DATABASE CONNECTION POOL ====================
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection is released within the pool timeout"""
+
+
+class PooledConnection(sqlite3.Connection):
+    """SQLite connection whose close() hands it back to its pool"""
+
+    pool = None
+    # Checkout generation while checked out, 0 while idle; lets a stale
+    # release (one from a previous holder) be told apart from the current one
+    checkout = 0
+
+    def close(self):
+        if self.pool is None:
+            super().close()
+        else:
+            self.pool.release(self)
+    
+    def execute(self, sql, parameters=()):
+        """Timed execute; see record_query()"""
+        cursor = self.cursor(InstrumentedCursor)
+        started = time.perf_counter()
+        try:
+            cursor.execute(sql, parameters)
+        finally:
+            seconds = time.perf_counter() - started
+            record_query(sql, parameters, seconds)
+        cursor.statement = (sql, parameters, seconds)
+        return cursor
+    
+    def executemany(self, sql, seq_of_parameters):
+        """Timed executemany; counted as one statement"""
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            record_query(sql, seq_of_parameters, time.perf_counter() - started, many=True)
+
+
+class ConnectionPool:
+    """Bounded pool of warm SQLite connections shared across request threads"""
+
+    def __init__(self, database, max_size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT, profile=DB_PROFILE):
+        if profile not in SQLITE_PROFILES:
+            raise ValueError(
+                f'Unknown SQLite profile {profile!r}. Must be one of: {", ".join(SQLITE_PROFILES)}'
+            )
+        self.database = database
+        self.profile = profile
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._size = 0
+        self._in_use = 0
+        self._waiting = 0
+        self._acquired = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _connect(self):
+        """Open a new connection with the row factory and profile PRAGMAs applied"""
+        conn = sqlite3.connect(self.database, factory=PooledConnection, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for name, value in SQLITE_PROFILES[self.profile].items():
+            conn.execute(f'PRAGMA {name} = {value}')
+        conn.pool = self
+        return conn
+
+    def acquire(self):
+        """
+        Check out an idle connection, opening a new one while below max_size.
+        A connection counts as in use once it is handed out (or being opened
+        for this caller); threads still waiting for one count as waiting.
+        """
+        with self._lock:
+            self._acquired += 1
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = None
+                grow = self._size < self.max_size
+                if grow:
+                    self._size += 1
+                    self._in_use += 1
+                else:
+                    self._waiting += 1
+            else:
+                self._in_use += 1
+
+        if conn is None and grow:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._lock:
+                    self._size -= 1
+                    self._in_use -= 1
+                raise
+
+        if conn is None:
+            started = time.perf_counter()
+            try:
+                conn = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                with self._lock:
+                    self._waiting -= 1
+                raise PoolTimeoutError(
+                    f'No database connection available after {self.timeout} seconds'
+                )
+            waited = time.perf_counter() - started
+            with self._lock:
+                self._waiting -= 1
+                self._in_use += 1
+                self._waits += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+
+        with self._lock:
+            self._checkouts += 1
+            conn.checkout = self._checkouts
+        return conn
+
+    def release(self, conn, checkout=None):
+        """
+        Return a connection to the pool, rolling back any open transaction.
+        With checkout (the connection's checkout generation when it was
+        acquired), it is only released if still in that same checkout, so a
+        late release cannot take it back from whoever acquired it next.
+        """
+        with self._lock:
+            if not conn.checkout or (checkout is not None and checkout != conn.checkout):
+                return
+            conn.checkout = 0
+
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # Broken connection: drop it so a fresh one is opened next time
+            with self._lock:
+                self._size -= 1
+                self._in_use -= 1
+            conn.pool = None
+            conn.close()
+            return
+
+        with self._lock:
+            self._in_use -= 1
+        self._idle.put(conn)
+
+    def close_all(self):
+        """Close every idle connection (used on shutdown and in tests)"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.pool = None
+            conn.close()
+            with self._lock:
+                self._size -= 1
+
+    def settings(self):
+        """The profile's PRAGMA values as actually in effect on a pooled connection"""
+        conn = self.acquire()
+        try:
+            return {
+                name: conn.execute(f'PRAGMA {name}').fetchone()[0]
+                for name in SQLITE_PROFILES[self.profile]
+            }
+        finally:
+            conn.close()
+
+    def stats(self):
+        """Pool size and wait-time counters for /api/health"""
+        with self._lock:
+            return {
+                'maxSize': self.max_size,
+                'size': self._size,
+                'inUse': self._in_use,
+                'idle': self._size - self._in_use,
+                'waiting': self._waiting,
+                'acquired': self._acquired,
+                'waits': self._waits,
+                'totalWaitMs': round(self._wait_total * 1000, 3),
+                'maxWaitMs': round(self._wait_max * 1000, 3),
+                'avgWaitMs': round(self._wait_total * 1000 / self._waits, 3) if self._waits else 0
+            }
+
+
+db_pool = ConnectionPool(DATABASE)
 
 def get_db_connection():
-    """Create a database connection"""
-    conn = sqlite3.connect(DATABASE)
-    conn.row_factory = sqlite3.Row
+    """
+    Check out a pooled database connection.
+    Inside a request the connection is also tracked on `g`, so it is returned
+    to the pool at teardown even when the handler fails before calling close().
+    """
+    conn = db_pool.acquire()
+    if has_app_context():
+        g.setdefault('db_connections', []).append((conn, conn.checkout))
     return conn
 
+@app.teardown_appcontext
+def release_db_connections(exception=None):
+    """Return any connection the request did not close itself"""
+    for conn, checkout in g.pop('db_connections', []):
+        if conn.pool is not None:
+            conn.pool.release(conn, checkout)
+
+# ==================== RESPONSE COMPRESSION ====================
+
+def compress_chunks(body, coding):
+    """
+    Compress body in COMPRESS_CHUNK_SIZE slices, yielding output as it is
+    produced so the compressed copy is streamed rather than buffered whole
+    """
+    if coding == 'br':
+        compressor = brotli.Compressor(quality=COMPRESS_BROTLI_LEVEL)
+        compress, finish = compressor.process, compressor.finish
+    else:
+        # wbits 31: deflate with a gzip header and trailer
+        compressor = zlib.compressobj(COMPRESS_GZIP_LEVEL, zlib.DEFLATED, 31)
+        compress, finish = compressor.compress, compressor.flush
+    
+    view = memoryview(body)
+    for start in range(0, len(view), COMPRESS_CHUNK_SIZE):
+        chunk = compress(view[start:start + COMPRESS_CHUNK_SIZE])
+        if chunk:
+            yield chunk
+    yield finish()
+
+@app.after_request
+def compress_response(response):
+    """gzip/brotli-encode JSON responses of at least COMPRESS_MIN_SIZE bytes"""
+    if (response.status_code != 200 or response.is_streamed or response.direct_passthrough
+            or response.mimetype not in COMPRESS_MIMETYPES or 'Content-Encoding' in response.headers):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    if response.content_length is None or response.content_length < COMPRESS_MIN_SIZE:
+        return response
+    
+    coding = request.accept_encodings.best_match(CONTENT_CODINGS)
+    if coding is None:
+        return response
+    
+    response.response = compress_chunks(response.get_data(), coding)
+    response.headers['Content-Encoding'] = coding
+    del response.headers['Content-Length']
+    
+    # A strong ETag must differ between encodings of the same resource
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-{coding}', weak)
+    return response
+
+# ==================== REQUEST METRICS ====================
+
+class Histogram:
+    """Fixed-bucket histogram; counts are per bucket, cumulated when rendered"""
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0
+    
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+def prometheus_labels(**labels):
+    """Render a Prometheus label set, escaping backslashes, quotes and newlines"""
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in labels.items()
+    )
+    return ','.join(f'{name}="{value}"' for name, value in escaped)
+
+class RequestMetrics:
+    """
+    Per-route request counters for /api/metrics: latency and response size
+    histograms keyed by (route, method, status), and in-flight gauges keyed by
+    (route, method). Routes are URL rules, not paths, so label sets stay bounded.
+    Counters are per process; each gunicorn worker reports its own.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latency = {}
+        self.size = {}
+        self.in_flight = {}
+    
+    def start(self, route, method):
+        with self.lock:
+            self.in_flight[(route, method)] = self.in_flight.get((route, method), 0) + 1
+    
+    def finish(self, route, method, status, seconds, size):
+        key = (route, method, status)
+        with self.lock:
+            self.in_flight[(route, method)] -= 1
+            if key not in self.latency:
+                self.latency[key] = Histogram(LATENCY_BUCKETS)
+                self.size[key] = Histogram(SIZE_BUCKETS)
+            self.latency[key].observe(seconds)
+            if size is not None:
+                self.size[key].observe(size)
+    
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self.lock:
+            histograms = [
+                ('rms_http_request_duration_seconds', 'Request latency in seconds', self.latency),
+                ('rms_http_response_size_bytes', 'Response body size in bytes, before compression', self.size),
+            ]
+            lines = []
+            for name, help_text, series in histograms:
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} histogram']
+                for (route, method, status), histogram in sorted(series.items()):
+                    labels = prometheus_labels(route=route, method=method, status=status)
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + ('+Inf',), histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'{name}_count{{{labels}}} {cumulative}')
+            
+            name = 'rms_http_requests_in_flight'
+            lines += [f'# HELP {name} Requests currently being handled', f'# TYPE {name} gauge']
+            for (route, method), count in sorted(self.in_flight.items()):
+                lines.append(f'{name}{{{prometheus_labels(route=route, method=method)}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+request_metrics = RequestMetrics()
+
+def metrics_route():
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+@app.before_request
+def start_request_metrics():
+    g.metrics_started = time.perf_counter()
+    request_metrics.start(metrics_route(), request.method)
+
+@app.after_request
+def capture_response_metrics(response):
+    """Registered after compress_response, so it runs first and sees the plain body size"""
+    g.metrics_response = (response.status_code, response.calculate_content_length())
+    return response
+
+@app.teardown_request
+def record_request_metrics(exception=None):
+    started = g.pop('metrics_started', None)
+    if started is None:
+        return  # a before_request hook failed before the timer started
+    # No response was captured when the view raised an unhandled exception
+    status, size = g.pop('metrics_response', (500, None))
+    request_metrics.finish(metrics_route(), request.method, status, time.perf_counter() - started, size)
+
 def init_database():
     """Initialize the database with required tables"""
     conn = get_db_connection()
@@ -63,6 +763,7 @@ def init_database():
             category TEXT NOT NULL DEFAULT 'Standard',
             price DECIMAL(10, 2) NOT NULL DEFAULT 2.00,
             capacity INTEGER NOT NULL DEFAULT 4,
+            turn_minutes INTEGER NOT NULL DEFAULT 90,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
@@ -140,6 +841,8 @@ def init_database():
             PaymentID INTEGER,
             EmpID INTEGER,
             reservation_date TEXT NOT NULL,
+            start_time TEXT,
+            end_time TEXT,
             party_size INTEGER NOT NULL DEFAULT 2,
             special_requests TEXT,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -150,6 +853,62 @@ def init_database():
         )
     ''')
     
+    # Create TABLE_VERSION table: a change counter per cached table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS table_version (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    for table in VERSIONED_TABLES:
+        conn.execute('INSERT OR IGNORE INTO table_version (name) VALUES (?)', (table,))
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE table_version SET version = version + 1 WHERE name = '{table}';
+                END
+            ''')
+    
+    # Create review statistics tables, kept current by triggers on review:
+    # review counts per rating (totals, average, distribution) and per UTC day
+    # (the rolling 7-day window)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS review_rating_count (
+            rating INTEGER PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS review_daily_count (
+            day TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS review_stats_insert
+        AFTER INSERT ON review
+        BEGIN
+            INSERT INTO review_rating_count (rating, count) VALUES (NEW.rating, 1)
+                ON CONFLICT (rating) DO UPDATE SET count = count + 1;
+            INSERT INTO review_daily_count (day, count) VALUES (date(NEW.created_at), 1)
+                ON CONFLICT (day) DO UPDATE SET count = count + 1;
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS review_stats_delete
+        AFTER DELETE ON review
+        BEGIN
+            UPDATE review_rating_count SET count = count - 1 WHERE rating = OLD.rating;
+            UPDATE review_daily_count SET count = count - 1 WHERE day = date(OLD.created_at);
+        END
+    ''')
+    
+    # Fill the statistics tables for reviews that predate them
+    if conn.execute('SELECT COUNT(*) FROM review_rating_count').fetchone()[0] == 0:
+        rebuild_review_stats(conn)
+    
     # Initialize default tables if none exist
     table_count = conn.execute('SELECT COUNT(*) FROM restaurant_table').fetchone()[0]
     if table_count == 0:
@@ -166,8 +925,8 @@ def init_database():
         ]
         for table_id, category, price, capacity in tables_data:
             conn.execute(
-                'INSERT INTO restaurant_table (TableID, category, price, capacity) VALUES (?, ?, ?, ?)',
-                (table_id, category, price, capacity)
+                'INSERT INTO restaurant_table (TableID, category, price, capacity, turn_minutes) VALUES (?, ?, ?, ?, ?)',
+                (table_id, category, price, capacity, TURN_MINUTES[category])
             )
     
     # Initialize sample menu items if none exist
@@ -194,9 +953,234 @@ def init_database():
                 item
             )
     
+    upgrade_reservation_slots(conn)
+    
+    # Reject overlapping or over-long slots in storage, whoever writes them:
+    # SQLite has no exclusion constraint, so triggers probe
+    # idx_reservation_table_start the way RESERVATION_OVERLAP_QUERY does
+    for event, columns, other in [
+        ('insert', 'INSERT', ''),
+        ('update', 'UPDATE OF TableID, start_time, end_time', 'AND ReservationID != NEW.ReservationID'),
+    ]:
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS reservation_slot_{event}
+            BEFORE {columns} ON reservation
+            WHEN NEW.start_time IS NOT NULL
+            BEGIN
+                SELECT RAISE(ABORT, 'Invalid reservation slot')
+                WHERE NEW.end_time IS NULL
+                   OR NEW.end_time <= NEW.start_time
+                   OR NEW.end_time > strftime('%Y-%m-%d %H:%M', NEW.start_time, '+{MAX_RESERVATION_MINUTES} minutes');
+                SELECT RAISE(ABORT, 'Reservation overlaps an existing booking')
+                WHERE EXISTS (
+                    SELECT 1 FROM reservation
+                    WHERE TableID = NEW.TableID
+                      AND start_time > strftime('%Y-%m-%d %H:%M', NEW.start_time, '-{MAX_RESERVATION_MINUTES} minutes')
+                      AND start_time < NEW.end_time
+                      AND end_time > NEW.start_time
+                      {other}
+                );
+            END
+        ''')
+    
+    # Create secondary indexes and make sure the hot queries use them
+    for statement in INDEXES:
+        conn.execute(statement)
+    check_hot_query_plans(conn)
+    
     conn.commit()
     conn.close()
 
+def upgrade_reservation_slots(conn):
+    """
+    Add the time slot columns to a database created before reservations had
+    them. Existing tables get their category's turn length and existing
+    bookings become whole-day slots on their reservation_date. Also drops the
+    old (TableID, reservation_date) index the slot index replaces.
+    """
+    table_columns = [row[1] for row in conn.execute('PRAGMA table_info(restaurant_table)')]
+    if 'turn_minutes' not in table_columns:
+        conn.execute(f'ALTER TABLE restaurant_table ADD COLUMN turn_minutes INTEGER NOT NULL DEFAULT {DEFAULT_TURN_MINUTES}')
+        conn.executemany(
+            'UPDATE restaurant_table SET turn_minutes = ? WHERE category = ?',
+            [(minutes, category) for category, minutes in TURN_MINUTES.items()]
+        )
+    
+    reservation_columns = [row[1] for row in conn.execute('PRAGMA table_info(reservation)')]
+    if 'start_time' not in reservation_columns:
+        conn.execute('ALTER TABLE reservation ADD COLUMN start_time TEXT')
+        conn.execute('ALTER TABLE reservation ADD COLUMN end_time TEXT')
+        conn.execute("""
+            UPDATE reservation
+            SET start_time = date(reservation_date) || ' 00:00',
+                end_time = date(reservation_date, '+1 day') || ' 00:00'
+        """)
+    
+    # Superseded by idx_reservation_table_start: no query matches on reservation_date any more
+    conn.execute('DROP INDEX IF EXISTS idx_reservation_table_date')
+
+def check_hot_query_plans(conn):
+    """
+    Run EXPLAIN QUERY PLAN for every registered hot query and warn about any
+    that fall back to a full table scan. Returns the names of those queries.
+    """
+    scanning = []
+    for name, (sql, params) in HOT_QUERIES.items():
+        plan = conn.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()
+        # A full scan shows as "SCAN <table>" (older SQLite: "SCAN TABLE <table>")
+        # with no "USING ... INDEX" clause
+        scans = [row['detail'] for row in plan
+                 if row['detail'].startswith('SCAN ') and ' USING ' not in row['detail']]
+        if scans:
+            scanning.append(name)
+            app.logger.warning('Hot query "%s" does a full table scan: %s', name, '; '.join(scans))
+    return scanning
+
+def rebuild_review_stats(conn):
+    """
+    Recompute the review statistics tables from the review table.
+    Returns the drift found before the rebuild as {counter: (stored, actual)};
+    an empty dict means the triggers kept the counters exact. The caller commits.
+    """
+    stored = {}
+    for row in conn.execute('SELECT rating, count FROM review_rating_count WHERE count != 0'):
+        stored[f"{row['rating']}_star"] = row['count']
+    for row in conn.execute('SELECT day, count FROM review_daily_count WHERE count != 0'):
+        stored[row['day']] = row['count']
+    
+    ratings = conn.execute('SELECT rating, COUNT(*) FROM review GROUP BY rating').fetchall()
+    days = conn.execute('SELECT date(created_at), COUNT(*) FROM review GROUP BY date(created_at)').fetchall()
+    actual = {f'{rating}_star': count for rating, count in ratings}
+    actual.update({day: count for day, count in days})
+    
+    conn.execute('DELETE FROM review_rating_count')
+    conn.execute('DELETE FROM review_daily_count')
+    conn.executemany('INSERT INTO review_rating_count (rating, count) VALUES (?, ?)', ratings)
+    conn.executemany('INSERT INTO review_daily_count (day, count) VALUES (?, ?)', days)
+    
+    return {
+        key: (stored.get(key, 0), actual.get(key, 0))
+        for key in sorted(stored.keys() | actual.keys())
+        if stored.get(key, 0) != actual.get(key, 0)
+    }
+
+def get_table_version(conn, table):
+    """Current change counter of a table listed in VERSIONED_TABLES"""
+    return conn.execute(
+        'SELECT version FROM table_version WHERE name = ?',
+        (table,)
+    ).fetchone()[0]
+
+def get_table_versions(conn, tables):
+    """Change counters of several VERSIONED_TABLES in one query, in the given order"""
+    rows = conn.execute(
+        'SELECT name, version FROM table_version WHERE name IN (SELECT value FROM json_each(?))',
+        (json.dumps(tables),)
+    ).fetchall()
+    versions = {row['name']: row['version'] for row in rows}
+    return [versions[table] for table in tables]
+
+def versioned_etag(*tables, scope=None):
+    """
+    Give a GET endpoint a strong ETag built from the change counters of the
+    tables its response is read from. A request whose If-None-Match matches is
+    answered with 304 Not Modified before the view (and its queries) runs.
+    scope, if given, maps the query args to a string added to the tag, for
+    responses that change without any write (such as "today").
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            conn = get_db_connection()
+            versions = get_table_versions(conn, tables)
+            conn.close()
+            etag = '-'.join(f'{table}.{version}' for table, version in zip(tables, versions))
+            if scope is not None:
+                etag = f'{etag}-{scope(request.args)}'
+            
+            # Compressed responses carry the tag with their coding appended
+            candidates = [etag] + [f'{etag}-{coding}' for coding in CONTENT_CODINGS]
+            matched = next((tag for tag in candidates if request.if_none_match.contains(tag)), None)
+            if matched:
+                response = app.response_class(status=304)
+                etag = matched
+            else:
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag)
+            # Let browsers keep the body but revalidate it on every request
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
+# ==================== PAGINATION HELPERS ====================
+
+class InvalidQueryArgs(ValueError):
+    """Bad query string value; read endpoints answer it with 400"""
+
+class InvalidPageArgs(InvalidQueryArgs):
+    """Bad ?limit= or ?after= value; list endpoints answer it with 400"""
+
+
+def encode_cursor(*values):
+    """Opaque cursor holding the sort-key values of the last row on a page"""
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, key_types):
+    """Decode a cursor made by encode_cursor(), checking it matches key_types"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    if (not isinstance(values, list) or len(values) != len(key_types)
+            or not all(type(value) is key_type for value, key_type in zip(values, key_types))):
+        raise InvalidPageArgs('Invalid pagination cursor')
+    return values
+
+def get_page_args(args, key_types=(int,)):
+    """
+    Read keyset pagination arguments (?limit=&after=) from a query string mapping.
+    Returns (limit, after). limit is None when neither argument is given, in
+    which case the endpoint returns the full list as before. after is the list
+    of decoded sort-key values, or None for the first page.
+    Raises InvalidPageArgs on a bad limit or cursor.
+    """
+    limit = args.get('limit')
+    after = args.get('after')
+    if limit is None and after is None:
+        return None, None
+
+    if limit is None:
+        limit = DEFAULT_PAGE_LIMIT
+    else:
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= MAX_PAGE_LIMIT:
+            raise InvalidPageArgs(f'limit must be an integer between 1 and {MAX_PAGE_LIMIT}')
+
+    if after is not None:
+        after = decode_cursor(after, key_types)
+    return limit, after
+
+def fetch_limit(limit):
+    """SQL LIMIT for a page: one extra row tells whether another page follows"""
+    return limit + 1 if limit is not None else -1
+
+def split_page(rows, limit, cursor_key):
+    """
+    Trim rows fetched with fetch_limit() down to one page.
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*cursor_key(rows[-1]))
+
 # ==================== AUTHENTICATION ENDPOINTS ====================
 
 @app.route('/api/auth/signup', methods=['POST'])
@@ -331,32 +1315,64 @@ def signin():
 
 # ==================== REVIEWS ENDPOINTS ====================
 
+def read_reviews(conn, args):
+    """
+    Payload of GET /api/reviews: all reviews, newest first, or one page of them.
+    args holds the query string (limit, after); raises InvalidPageArgs on bad values
+    """
+    limit, after = get_page_args(args, (str, int))
+    
+    keyset = ''
+    params = []
+    if after:
+        keyset = 'WHERE (created_at, ReviewID) < (?, ?)'
+        params.extend(after)
+    params.append(fetch_limit(limit))
+    
+    reviews = conn.execute(f'''
+        SELECT ReviewID, name, rating, description, created_at FROM review
+        {keyset}
+        ORDER BY created_at DESC, ReviewID DESC
+        LIMIT ?
+    ''', params).fetchall()
+    reviews, next_cursor = split_page(reviews, limit, lambda row: (row['created_at'], row['ReviewID']))
+    
+    # Convert to list of dictionaries
+    reviews_list = []
+    for review in reviews:
+        reviews_list.append({
+            'id': review['ReviewID'],
+            'name': review['name'],
+            'rating': review['rating'],
+            'comment': review['description'],
+            'date': review['created_at'].split()[0] if review['created_at'] else ''
+        })
+    
+    result = {
+        'success': True,
+        'reviews': reviews_list,
+        'message': 'No reviews present' if len(reviews_list) == 0 else None
+    }
+    if limit is not None:
+        result['nextCursor'] = next_cursor
+    
+    return result
+
 @app.route('/api/reviews', methods=['GET'])
+@versioned_etag('review')
 def get_reviews():
-    """Get all reviews"""
+    """Get all reviews (newest first), optionally one page at a time"""
     try:
         conn = get_db_connection()
-        reviews = conn.execute(
-            'SELECT ReviewID, name, rating, description, created_at FROM review ORDER BY created_at DESC'
-        ).fetchall()
+        result = read_reviews(conn, request.args)
         conn.close()
         
-        # Convert to list of dictionaries
-        reviews_list = []
-        for review in reviews:
-            reviews_list.append({
-                'id': review['ReviewID'],
-                'name': review['name'],
-                'rating': review['rating'],
-                'comment': review['description'],
-                'date': review['created_at'].split()[0] if review['created_at'] else ''
-            })
-        
+        return jsonify(result)
+    except InvalidPageArgs as e:
         return jsonify({
-            'success': True,
-            'reviews': reviews_list,
-            'message': 'No reviews present' if len(reviews_list) == 0 else None
-        })
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -481,32 +1497,34 @@ def get_stats():
     try:
         conn = get_db_connection()
         
-        # Get total reviews count
-        total_reviews = conn.execute('SELECT COUNT(*) FROM review').fetchone()[0]
-        
-        # Get average rating
-        avg_rating = conn.execute('SELECT AVG(rating) FROM review').fetchone()[0]
-        avg_rating = round(avg_rating, 1) if avg_rating else 0
-        
-        # Get rating distribution
-        rating_dist = conn.execute('''
-            SELECT rating, COUNT(*) as count 
-            FROM review 
-            GROUP BY rating 
+        # Totals, average and distribution come from the per-rating counters (at most 5 rows)
+        rating_counts = conn.execute('''
+            SELECT rating, count
+            FROM review_rating_count
+            WHERE count > 0
             ORDER BY rating DESC
         ''').fetchall()
         
-        # Get recent reviews count (last 7 days)
+        # Recent reviews (last 7 days): whole days after the cutoff day come from
+        # the per-day counters, the cutoff day itself from an indexed range scan
         recent_reviews = conn.execute('''
-            SELECT COUNT(*) FROM review 
-            WHERE created_at >= datetime('now', '-7 days')
+            SELECT
+                (SELECT COALESCE(SUM(count), 0) FROM review_daily_count
+                 WHERE day > date('now', '-7 days'))
+              + (SELECT COUNT(*) FROM review
+                 WHERE created_at >= datetime('now', '-7 days')
+                   AND created_at < date('now', '-6 days'))
         ''').fetchone()[0]
         
         conn.close()
         
+        total_reviews = sum(row['count'] for row in rating_counts)
+        avg_rating = sum(row['rating'] * row['count'] for row in rating_counts) / total_reviews if total_reviews else None
+        avg_rating = round(avg_rating, 1) if avg_rating else 0
+        
         # Format rating distribution
         rating_distribution = {}
-        for row in rating_dist:
+        for row in rating_counts:
             rating_distribution[f"{row['rating']}_star"] = row['count']
         
         return jsonify({
@@ -525,34 +1543,93 @@ def get_stats():
             'error': str(e)
         }), 500
 
+# ==================== MENU CACHE ====================
+
+class MenuSnapshot:
+    """Immutable copy of the menu table at one table_version"""
+
+    def __init__(self, version, rows):
+        self.version = version
+        # Rows keyed by ItemID, for pricing order lines
+        self.by_id = {row['id']: row for row in rows}
+        # GET /api/menu payload, ordered by category then name
+        self.items = [{
+            'id': row['id'],
+            'name': row['name'],
+            'price': float(row['price']),
+            'category': row['category'],
+            'description': row['description']
+        } for row in rows]
+        # GET /api/menu/categories payload (rows are already sorted by category)
+        self.categories = list(dict.fromkeys(row['category'] for row in rows))
+
+    def find(self, item_id):
+        """Menu row for an item ID, or None (numeric strings match like in SQL)"""
+        if isinstance(item_id, str) and item_id.strip().isdigit():
+            item_id = int(item_id)
+        try:
+            return self.by_id.get(item_id)
+        except TypeError:
+            return None
+
+
+class MenuCache:
+    """
+    In-process menu snapshot shared by the menu endpoints and create_order().
+    Each read compares the snapshot against the menu's table_version, so a
+    change made by another worker process is picked up on the next request.
+    """
+
+    def __init__(self):
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def get(self, conn):
+        """Current snapshot, reloaded from the database if the menu has changed"""
+        version = get_table_version(conn, 'menu')
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != version:
+                # Version is read before the rows, so the rows are never older than it
+                rows = conn.execute(
+                    'SELECT ItemID as id, name, price, category, description FROM menu ORDER BY category, name'
+                ).fetchall()
+                snapshot = MenuSnapshot(version, rows)
+                self._snapshot = snapshot
+        return snapshot
+
+    def invalidate(self):
+        """Drop the snapshot after a menu write in this process"""
+        self._snapshot = None
+
+
+menu_cache = MenuCache()
+
 # ==================== MENU MANAGEMENT ENDPOINTS ====================
 
+def read_menu(conn, args):
+    """Payload of GET /api/menu, from the menu snapshot"""
+    menu_list = menu_cache.get(conn).items
+    return {
+        'success': True,
+        'menu': menu_list,
+        'message': 'No menu items present' if len(menu_list) == 0 else None
+    }
+
 @app.route('/api/menu', methods=['GET'])
+@versioned_etag('menu')
 def get_menu():
     """Get all menu items"""
     try:
         conn = get_db_connection()
-        menu_items = conn.execute(
-            'SELECT ItemID as id, name, price, category, description FROM menu ORDER BY category, name'
-        ).fetchall()
+        result = read_menu(conn, request.args)
         conn.close()
         
-        # Convert to list of dictionaries
-        menu_list = []
-        for item in menu_items:
-            menu_list.append({
-                'id': item['id'],
-                'name': item['name'],
-                'price': float(item['price']),
-                'category': item['category'],
-                'description': item['description']
-            })
-        
-        return jsonify({
-            'success': True,
-            'menu': menu_list,
-            'message': 'No menu items present' if len(menu_list) == 0 else None
-        })
+        return jsonify(result)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -593,6 +1670,7 @@ def create_menu_item():
         item_id = cursor.lastrowid
         conn.commit()
         conn.close()
+        menu_cache.invalidate()
         
         return jsonify({
             'success': True,
@@ -678,6 +1756,7 @@ def update_menu_item(item_id):
             (data['name'], price, data['category'], data['description'], item_id)
         )
         conn.commit()
+        menu_cache.invalidate()
         
         if cursor.rowcount > 0:
             conn.close()
@@ -712,6 +1791,7 @@ def delete_menu_item(item_id):
         conn = get_db_connection()
         cursor = conn.execute('DELETE FROM menu WHERE ItemID = ?', (item_id,))
         conn.commit()
+        menu_cache.invalidate()
         
         if cursor.rowcount > 0:
             conn.close()
@@ -732,23 +1812,25 @@ def delete_menu_item(item_id):
             'error': str(e)
         }), 500
 
+def read_menu_categories(conn, args):
+    """Payload of GET /api/menu/categories, from the menu snapshot"""
+    category_list = menu_cache.get(conn).categories
+    return {
+        'success': True,
+        'categories': category_list,
+        'message': 'No categories present' if len(category_list) == 0 else None
+    }
+
 @app.route('/api/menu/categories', methods=['GET'])
+@versioned_etag('menu')
 def get_menu_categories():
     """Get all unique menu categories"""
     try:
         conn = get_db_connection()
-        categories = conn.execute(
-            'SELECT DISTINCT category FROM menu ORDER BY category'
-        ).fetchall()
+        result = read_menu_categories(conn, request.args)
         conn.close()
         
-        category_list = [row['category'] for row in categories]
-        
-        return jsonify({
-            'success': True,
-            'categories': category_list,
-            'message': 'No categories present' if len(category_list) == 0 else None
-        })
+        return jsonify(result)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -808,14 +1890,34 @@ def create_customer():
 
 @app.route('/api/customers', methods=['GET'])
 def get_customers():
-    """Get all customers"""
+    """Get all customers (newest first), optionally one page at a time"""
     try:
+        try:
+            limit, after = get_page_args(request.args)
+        except InvalidPageArgs as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        keyset = ''
+        params = []
+        if after:
+            keyset = 'WHERE CustomerID < ?'
+            params.extend(after)
+        params.append(fetch_limit(limit))
+        
         conn = get_db_connection()
-        customers = conn.execute(
-            'SELECT CustomerID, CustomerName, phone, created_at FROM customer ORDER BY CustomerID DESC'
-        ).fetchall()
+        customers = conn.execute(f'''
+            SELECT CustomerID, CustomerName, phone, created_at FROM customer
+            {keyset}
+            ORDER BY CustomerID DESC
+            LIMIT ?
+        ''', params).fetchall()
         conn.close()
         
+        customers, next_cursor = split_page(customers, limit, lambda row: (row['CustomerID'],))
+        
         customers_list = []
         for customer in customers:
             customers_list.append({
@@ -825,10 +1927,14 @@ def get_customers():
                 'createdAt': customer['created_at']
             })
         
-        return jsonify({
+        result = {
             'success': True,
             'customers': customers_list
-        })
+        }
+        if limit is not None:
+            result['nextCursor'] = next_cursor
+        
+        return jsonify(result)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -870,38 +1976,147 @@ def get_employees():
 # ==================== ORDERING TRANSACTION ENDPOINTS ====================
 # Transaction involves: orders, order_item, menu, customer, employee tables
 
-@app.route('/api/orders', methods=['POST'])
-def create_order():
+def get_order_items_by_order(conn, order_ids):
     """
-    Create a new order (TRANSACTION 1: Ordering)
-    Involves tables: orders, order_item, menu, customer, employee
+    Fetch the line items of many orders in one query.
+    Returns {OrderID: [rows]} with each order's items in ItemID order, the same
+    order the single-order lookup in get_order() returns them in.
     """
-    try:
-        data = request.get_json()
+    items_by_order = {}
+    if not order_ids:
+        return items_by_order
+
+    # The IDs are bound as one JSON array so the statement is the same for any count
+    items = conn.execute('''
+        SELECT 
+            oi.OrderID,
+            oi.ItemID,
+            oi.quantity,
+            m.name,
+            m.price,
+            (oi.quantity * m.price) as item_total
+        FROM order_item oi
+        JOIN menu m ON oi.ItemID = m.ItemID
+        WHERE oi.OrderID IN (SELECT value FROM json_each(?))
+        ORDER BY oi.OrderID, oi.ItemID
+    ''', (json.dumps(list(order_ids)),)).fetchall()
+
+    for item in items:
+        items_by_order.setdefault(item['OrderID'], []).append(item)
+    return items_by_order
+
+class InvalidOrder(ValueError):
+    """An order payload create_order() rejects; status is the HTTP status it answers with"""
+    
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def parse_order(data):
+    """
+    Checks on an order payload that need no database access.
+    Returns (customer_name, emp_id, phone, items); raises InvalidOrder.
+    """
+    # Validate required fields
+    required_fields = ['customerName', 'empId', 'items']
+    if not isinstance(data, dict) or not all(key in data for key in required_fields):
+        raise InvalidOrder('Missing required fields: customerName, empId, items')
+    
+    customer_name = data['customerName'].strip()
+    emp_id = data['empId']
+    items = data['items']  # List of {itemId, quantity}
+    
+    if not customer_name:
+        raise InvalidOrder('Customer name cannot be empty')
+    
+    if not items or len(items) == 0:
+        raise InvalidOrder('Order must contain at least one item')
+    
+    phone = data.get('phone', '')  # Optional phone number
+    return customer_name, emp_id, phone, items
+
+def check_employee(conn, emp_id, known=None):
+    """Raise InvalidOrder (404) unless the employee exists; known memoizes lookups across a batch"""
+    if known is not None and emp_id in known:
+        exists = known[emp_id]
+    else:
+        exists = conn.execute('SELECT EmpID FROM employee WHERE EmpID = ?', (emp_id,)).fetchone() is not None
+        if known is not None:
+            known[emp_id] = exists
+    if not exists:
+        raise InvalidOrder('Employee not found', 404)
+
+def resolve_order_lines(items, menu):
+    """
+    Price every line from the menu snapshot. Repeated itemIds are merged into
+    one line (order_item is keyed on OrderID, ItemID).
+    Returns {item_id: [menu_item, quantity]}; raises InvalidOrder.
+    """
+    merged_lines = {}
+    for item in items:
+        if not isinstance(item, dict) or 'itemId' not in item or 'quantity' not in item:
+            raise InvalidOrder('Each item must have itemId and quantity')
         
-        # Validate required fields
-        required_fields = ['customerName', 'empId', 'items']
-        if not data or not all(key in data for key in required_fields):
-            return jsonify({
-                'success': False,
-                'error': 'Missing required fields: customerName, empId, items'
-            }), 400
+        item_id = item['itemId']
+        quantity = item['quantity']
         
-        customer_name = data['customerName'].strip()
-        emp_id = data['empId']
-        items = data['items']  # List of {itemId, quantity}
+        if not isinstance(quantity, (int, float)) or isinstance(quantity, bool):
+            raise InvalidOrder('Quantity must be a number')
         
-        if not customer_name:
-            return jsonify({
-                'success': False,
-                'error': 'Customer name cannot be empty'
-            }), 400
+        if quantity <= 0:
+            raise InvalidOrder('Quantity must be greater than 0')
+        
+        menu_item = menu.find(item_id)
         
-        if not items or len(items) == 0:
+        if not menu_item:
+            raise InvalidOrder(f'Menu item with ID {item_id} not found', 404)
+        
+        if menu_item['id'] in merged_lines:
+            merged_lines[menu_item['id']][1] += quantity
+        else:
+            merged_lines[menu_item['id']] = [menu_item, quantity]
+    return merged_lines
+
+def order_payload(order_id, customer_id, customer_name, emp_id, current_date, merged_lines):
+    """The 'order' object create_order() returns"""
+    order_items = []
+    total_amount = 0
+    for item_id, (menu_item, quantity) in merged_lines.items():
+        item_total = menu_item['price'] * quantity
+        total_amount += item_total
+        
+        order_items.append({
+            'itemId': item_id,
+            'name': menu_item['name'],
+            'quantity': quantity,
+            'price': menu_item['price'],
+            'total': item_total
+        })
+    
+    return {
+        'orderId': order_id,
+        'customerId': customer_id,
+        'customerName': customer_name,
+        'empId': emp_id,
+        'date': current_date,
+        'items': order_items,
+        'totalAmount': round(total_amount, 2)
+    }
+
+@app.route('/api/orders', methods=['POST'])
+def create_order():
+    """
+    Create a new order (TRANSACTION 1: Ordering)
+    Involves tables: orders, order_item, menu, customer, employee
+    """
+    try:
+        try:
+            customer_name, emp_id, phone, items = parse_order(request.get_json())
+        except InvalidOrder as e:
             return jsonify({
                 'success': False,
-                'error': 'Order must contain at least one item'
-            }), 400
+                'error': str(e)
+            }), e.status
         
         conn = get_db_connection()
         
@@ -910,28 +2125,28 @@ def create_order():
             conn.execute('BEGIN TRANSACTION')
             
             # 1. Verify employee exists
-            employee = conn.execute(
-                'SELECT EmpID FROM employee WHERE EmpID = ?',
-                (emp_id,)
-            ).fetchone()
-            
-            if not employee:
+            # 2. Verify all menu items exist, priced from the menu snapshot in memory.
+            # Every line is resolved before the first write, so the write lock is
+            # only held for the inserts below.
+            try:
+                check_employee(conn, emp_id)
+                merged_lines = resolve_order_lines(items, menu_cache.get(conn))
+            except InvalidOrder as e:
                 conn.rollback()
                 conn.close()
                 return jsonify({
                     'success': False,
-                    'error': 'Employee not found'
-                }), 404
+                    'error': str(e)
+                }), e.status
             
-            # 2. Create customer (always create new, even if name exists)
-            phone = data.get('phone', '')  # Optional phone number
+            # 3. Create customer (always create new, even if name exists)
             cursor = conn.execute(
                 'INSERT INTO customer (CustomerName, phone) VALUES (?, ?)',
                 (customer_name, phone)
             )
             customer_id = cursor.lastrowid
             
-            # 3. Create order
+            # 4. Create order
             current_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             cursor = conn.execute(
                 'INSERT INTO orders (date, EmpID, CustomerID, customer_name) VALUES (?, ?, ?, ?)',
@@ -939,60 +2154,11 @@ def create_order():
             )
             order_id = cursor.lastrowid
             
-            # 4. Verify all menu items exist and add order items
-            order_items = []
-            total_amount = 0
-            
-            for item in items:
-                if 'itemId' not in item or 'quantity' not in item:
-                    conn.rollback()
-                    conn.close()
-                    return jsonify({
-                        'success': False,
-                        'error': 'Each item must have itemId and quantity'
-                    }), 400
-                
-                item_id = item['itemId']
-                quantity = item['quantity']
-                
-                if quantity <= 0:
-                    conn.rollback()
-                    conn.close()
-                    return jsonify({
-                        'success': False,
-                        'error': 'Quantity must be greater than 0'
-                    }), 400
-                
-                # Verify menu item exists and get price
-                menu_item = conn.execute(
-                    'SELECT ItemID, name, price FROM menu WHERE ItemID = ?',
-                    (item_id,)
-                ).fetchone()
-                
-                if not menu_item:
-                    conn.rollback()
-                    conn.close()
-                    return jsonify({
-                        'success': False,
-                        'error': f'Menu item with ID {item_id} not found'
-                    }), 404
-                
-                # Insert order item
-                conn.execute(
-                    'INSERT INTO order_item (OrderID, ItemID, quantity) VALUES (?, ?, ?)',
-                    (order_id, item_id, quantity)
-                )
-                
-                item_total = menu_item['price'] * quantity
-                total_amount += item_total
-                
-                order_items.append({
-                    'itemId': item_id,
-                    'name': menu_item['name'],
-                    'quantity': quantity,
-                    'price': menu_item['price'],
-                    'total': item_total
-                })
+            # 5. Add all order items with one bulk insert
+            conn.executemany(
+                'INSERT INTO order_item (OrderID, ItemID, quantity) VALUES (?, ?, ?)',
+                [(order_id, item_id, quantity) for item_id, (_, quantity) in merged_lines.items()]
+            )
             
             # Commit transaction
             conn.commit()
@@ -1001,15 +2167,7 @@ def create_order():
             return jsonify({
                 'success': True,
                 'message': 'Order created successfully',
-                'order': {
-                    'orderId': order_id,
-                    'customerId': customer_id,
-                    'customerName': customer_name,
-                    'empId': emp_id,
-                    'date': current_date,
-                    'items': order_items,
-                    'totalAmount': round(total_amount, 2)
-                }
+                'order': order_payload(order_id, customer_id, customer_name, emp_id, current_date, merged_lines)
             }), 201
             
         except Exception as e:
@@ -1023,73 +2181,222 @@ def create_order():
             'error': str(e)
         }), 500
 
-@app.route('/api/orders', methods=['GET'])
-def get_orders():
-    """Get all orders with their items"""
+@app.route('/api/orders/batch', methods=['POST'])
+def create_orders_batch():
+    """
+    Create many orders in one request, e.g. orders a POS terminal queued while offline.
+    Body: {orders: [create_order body, ...], chunkSize: optional}. Each order is
+    validated exactly like POST /api/orders, inside the write transaction of its
+    chunk; invalid ones are reported and skipped. Valid orders are committed in
+    one transaction, or one per chunkSize orders, with the chunk's order lines
+    in one statement. Returns one result per order, in order.
+    """
     try:
-        conn = get_db_connection()
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({
+                'success': False,
+                'error': 'Request body must be a JSON object'
+            }), 400
         
-        # Get all orders
-        orders = conn.execute('''
-            SELECT 
-                o.OrderID,
-                o.date,
-                o.customer_name,
-                o.CustomerID,
-                o.EmpID,
-                e.email as emp_email
-            FROM orders o
-            LEFT JOIN employee e ON o.EmpID = e.EmpID
-            ORDER BY o.OrderID DESC
-        ''').fetchall()
+        orders = data.get('orders')
+        if not isinstance(orders, list) or not orders:
+            return jsonify({
+                'success': False,
+                'error': 'orders must be a non-empty list'
+            }), 400
         
-        orders_list = []
-        for order in orders:
-            order_id = order['OrderID']
-            
-            # Get order items with menu details
-            items = conn.execute('''
-                SELECT 
-                    oi.ItemID,
-                    oi.quantity,
-                    m.name,
-                    m.price,
-                    (oi.quantity * m.price) as item_total
-                FROM order_item oi
-                JOIN menu m ON oi.ItemID = m.ItemID
-                WHERE oi.OrderID = ?
-            ''', (order_id,)).fetchall()
-            
-            items_list = []
-            total_amount = 0
-            for item in items:
-                items_list.append({
-                    'itemId': item['ItemID'],
-                    'name': item['name'],
-                    'quantity': item['quantity'],
-                    'price': item['price'],
-                    'total': item['item_total']
-                })
-                total_amount += item['item_total']
+        if len(orders) > ORDER_BATCH_MAX_ORDERS:
+            return jsonify({
+                'success': False,
+                'error': f'A batch may contain at most {ORDER_BATCH_MAX_ORDERS} orders'
+            }), 400
+        
+        chunk_size = data.get('chunkSize', len(orders))
+        if not isinstance(chunk_size, int) or isinstance(chunk_size, bool) or chunk_size < 1:
+            return jsonify({
+                'success': False,
+                'error': 'chunkSize must be a positive integer'
+            }), 400
+        
+        results = [None] * len(orders)
+        
+        # Payload checks need no database access
+        parsed = []
+        for index, order in enumerate(orders):
+            try:
+                parsed.append((index, *parse_order(order)))
+            except InvalidOrder as e:
+                results[index] = {'index': index, 'success': False, 'status': e.status, 'error': str(e)}
+            except Exception as e:
+                results[index] = {'index': index, 'success': False, 'status': 500, 'error': str(e)}
+        
+        conn = get_db_connection()
+        
+        try:
+            for start in range(0, len(parsed), chunk_size):
+                chunk = parsed[start:start + chunk_size]
+                created = []
+                try:
+                    # Validate against the same write transaction the orders are
+                    # inserted in, so an employee or menu item removed meanwhile
+                    # is reported for its order, as create_order() would
+                    conn.execute('BEGIN IMMEDIATE')
+                    menu = menu_cache.get(conn)
+                    known_employees = {}
+                    current_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    
+                    for index, customer_name, emp_id, phone, items in chunk:
+                        try:
+                            check_employee(conn, emp_id, known_employees)
+                            merged_lines = resolve_order_lines(items, menu)
+                        except InvalidOrder as e:
+                            results[index] = {'index': index, 'success': False, 'status': e.status, 'error': str(e)}
+                            continue
+                        except Exception as e:
+                            # Nothing is written for an order before it validates,
+                            # so the rest of the chunk is unaffected
+                            results[index] = {'index': index, 'success': False, 'status': 500, 'error': str(e)}
+                            continue
+                        
+                        customer_id = conn.execute(
+                            'INSERT INTO customer (CustomerName, phone) VALUES (?, ?)',
+                            (customer_name, phone)
+                        ).lastrowid
+                        order_id = conn.execute(
+                            'INSERT INTO orders (date, EmpID, CustomerID, customer_name) VALUES (?, ?, ?, ?)',
+                            (current_date, emp_id, customer_id, customer_name)
+                        ).lastrowid
+                        created.append((index, customer_id, order_id, customer_name, emp_id, merged_lines))
+                    
+                    # All lines of the chunk in one statement
+                    conn.executemany(
+                        'INSERT INTO order_item (OrderID, ItemID, quantity) VALUES (?, ?, ?)',
+                        [
+                            (order_id, item_id, quantity)
+                            for _, _, order_id, _, _, lines in created
+                            for item_id, (_, quantity) in lines.items()
+                        ]
+                    )
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    for index, *_ in chunk:
+                        if results[index] is None:
+                            results[index] = {'index': index, 'success': False, 'status': 500, 'error': str(e)}
+                    continue
+                
+                for index, customer_id, order_id, customer_name, emp_id, lines in created:
+                    results[index] = {
+                        'index': index,
+                        'success': True,
+                        'order': order_payload(order_id, customer_id, customer_name, emp_id, current_date, lines)
+                    }
             
-            orders_list.append({
-                'orderId': order_id,
-                'date': order['date'],
-                'customerName': order['customer_name'],
-                'customerId': order['CustomerID'],
-                'empId': order['EmpID'],
-                'empEmail': order['emp_email'],
-                'items': items_list,
-                'totalAmount': round(total_amount, 2)
-            })
+            conn.close()
+        except Exception as e:
+            conn.rollback()
+            conn.close()
+            raise e
         
-        conn.close()
+        failed = sum(1 for result in results if not result['success'])
+        return jsonify({
+            'success': failed == 0,
+            'created': len(results) - failed,
+            'failed': failed,
+            'results': results
+        }), 201 if failed == 0 else 207
         
+    except Exception as e:
         return jsonify({
-            'success': True,
-            'orders': orders_list
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def read_orders(conn, args):
+    """
+    Payload of GET /api/orders: all orders with their items, newest first, or one page of them.
+    args holds the query string (limit, after); raises InvalidPageArgs on bad values
+    """
+    limit, after = get_page_args(args)
+    
+    keyset = ''
+    params = []
+    if after:
+        keyset = 'WHERE o.OrderID < ?'
+        params.extend(after)
+    params.append(fetch_limit(limit))
+    
+    # Get all orders (or one page of them)
+    orders = conn.execute(f'''
+        SELECT 
+            o.OrderID,
+            o.date,
+            o.customer_name,
+            o.CustomerID,
+            o.EmpID,
+            e.email as emp_email
+        FROM orders o
+        LEFT JOIN employee e ON o.EmpID = e.EmpID
+        {keyset}
+        ORDER BY o.OrderID DESC
+        LIMIT ?
+    ''', params).fetchall()
+    orders, next_cursor = split_page(orders, limit, lambda row: (row['OrderID'],))
+    
+    # Get the items of every order in one query instead of one per order
+    items_by_order = get_order_items_by_order(conn, [order['OrderID'] for order in orders])
+    
+    orders_list = []
+    for order in orders:
+        order_id = order['OrderID']
+        
+        items_list = []
+        total_amount = 0
+        for item in items_by_order.get(order_id, []):
+            items_list.append({
+                'itemId': item['ItemID'],
+                'name': item['name'],
+                'quantity': item['quantity'],
+                'price': item['price'],
+                'total': item['item_total']
+            })
+            total_amount += item['item_total']
+        
+        orders_list.append({
+            'orderId': order_id,
+            'date': order['date'],
+            'customerName': order['customer_name'],
+            'customerId': order['CustomerID'],
+            'empId': order['EmpID'],
+            'empEmail': order['emp_email'],
+            'items': items_list,
+            'totalAmount': round(total_amount, 2)
         })
+    
+    result = {
+        'success': True,
+        'orders': orders_list
+    }
+    if limit is not None:
+        result['nextCursor'] = next_cursor
+    
+    return result
+
+@app.route('/api/orders', methods=['GET'])
+def get_orders():
+    """Get all orders with their items (newest first), optionally one page at a time"""
+    try:
+        conn = get_db_connection()
+        result = read_orders(conn, request.args)
+        conn.close()
         
+        return jsonify(result)
+    except InvalidPageArgs as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -1372,70 +2679,98 @@ def create_bill():
             'error': str(e)
         }), 500
 
-@app.route('/api/bills', methods=['GET'])
-def get_bills():
-    """Get all bills with their order details"""
-    try:
-        conn = get_db_connection()
-        
-        # Get all bills with order information
-        bills = conn.execute('''
-            SELECT 
-                b.billID,
-                b.OrderID,
-                b.amount,
-                b.method,
-                b.date,
-                o.customer_name,
-                o.CustomerID
-            FROM bill b
-            JOIN orders o ON b.OrderID = o.OrderID
-            ORDER BY b.billID DESC
-        ''').fetchall()
-        
-        bills_list = []
-        for bill in bills:
-            order_id = bill['OrderID']
-            
-            # Get order items
-            items = conn.execute('''
-                SELECT 
-                    oi.ItemID,
-                    oi.quantity,
-                    m.name,
-                    m.price
-                FROM order_item oi
-                JOIN menu m ON oi.ItemID = m.ItemID
-                WHERE oi.OrderID = ?
-            ''', (order_id,)).fetchall()
-            
+def read_bills(conn, args):
+    """
+    Payload of GET /api/bills: all bills with their order details and items, newest first, or one page of them.
+    args holds the query string (limit, after); raises InvalidPageArgs on bad values
+    """
+    limit, after = get_page_args(args)
+    
+    # A page is cut from the bill table first so LIMIT counts bills, not item rows
+    bill_source = 'bill'
+    params = []
+    if limit is not None:
+        keyset = ''
+        if after:
+            keyset = 'WHERE billID < ?'
+            params.extend(after)
+        bill_source = f'(SELECT * FROM bill {keyset} ORDER BY billID DESC LIMIT ?)'
+        params.append(fetch_limit(limit))
+    
+    # Get all bills with order information and line items in one query.
+    # Rows arrive grouped by bill (items in ItemID order), so they are
+    # assembled in a single pass. The LEFT JOINs keep bills without items;
+    # rows with no matching menu item are skipped, as the inner join did.
+    rows = conn.execute(f'''
+        SELECT 
+            b.billID,
+            b.OrderID,
+            b.amount,
+            b.method,
+            b.date,
+            o.customer_name,
+            o.CustomerID,
+            oi.ItemID,
+            oi.quantity,
+            m.name,
+            m.price
+        FROM {bill_source} b
+        JOIN orders o ON b.OrderID = o.OrderID
+        LEFT JOIN order_item oi ON oi.OrderID = b.OrderID
+        LEFT JOIN menu m ON oi.ItemID = m.ItemID
+        ORDER BY b.billID DESC, oi.ItemID
+    ''', params).fetchall()
+    
+    bills_list = []
+    bill_id = None
+    for row in rows:
+        if row['billID'] != bill_id:
+            bill_id = row['billID']
             items_list = []
-            for item in items:
-                items_list.append({
-                    'itemId': item['ItemID'],
-                    'name': item['name'],
-                    'quantity': item['quantity'],
-                    'price': item['price']
-                })
-            
             bills_list.append({
-                'billId': bill['billID'],
-                'orderId': order_id,
-                'customerName': bill['customer_name'],
-                'customerId': bill['CustomerID'],
-                'amount': bill['amount'],
-                'paymentMethod': bill['method'],
-                'date': bill['date'],
+                'billId': bill_id,
+                'orderId': row['OrderID'],
+                'customerName': row['customer_name'],
+                'customerId': row['CustomerID'],
+                'amount': row['amount'],
+                'paymentMethod': row['method'],
+                'date': row['date'],
                 'items': items_list
             })
         
+        if row['name'] is not None:
+            items_list.append({
+                'itemId': row['ItemID'],
+                'name': row['name'],
+                'quantity': row['quantity'],
+                'price': row['price']
+            })
+    
+    bills_list, next_cursor = split_page(bills_list, limit, lambda bill: (bill['billId'],))
+    
+    result = {
+        'success': True,
+        'bills': bills_list
+    }
+    if limit is not None:
+        result['nextCursor'] = next_cursor
+    
+    return result
+
+@app.route('/api/bills', methods=['GET'])
+def get_bills():
+    """Get all bills with their order details (newest first), optionally one page at a time"""
+    try:
+        conn = get_db_connection()
+        result = read_bills(conn, request.args)
         conn.close()
         
+        return jsonify(result)
+    except InvalidPageArgs as e:
         return jsonify({
-            'success': True,
-            'bills': bills_list
-        })
-        
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -1517,99 +2852,345 @@ def get_bill(bill_id):
 
 # ==================== RESERVATION ENDPOINTS ====================
 
+def read_tables(conn, args):
+    """
+    Payload of GET /api/tables: every table once, with its status on ?date=
+    (default today). A table is reserved when a booking overlaps that day;
+    the customer and reservation shown are those of its first booking.
+    Raises InvalidQueryArgs on a bad date
+    """
+    day = datetime.combine(date.today(), datetime.min.time())
+    if 'date' in args:
+        try:
+            day = datetime.strptime(args['date'], '%Y-%m-%d')
+        except ValueError:
+            raise InvalidQueryArgs('date must be YYYY-MM-DD')
+    
+    # At most one booking per table, probed in idx_reservation_table_start
+    # within the day's bounds, so older reservations are never read
+    tables = conn.execute(TABLE_STATUS_QUERY, (
+        (day - timedelta(minutes=MAX_RESERVATION_MINUTES)).strftime(SLOT_FORMAT),
+        (day + timedelta(days=1)).strftime(SLOT_FORMAT),
+        day.strftime(SLOT_FORMAT)
+    )).fetchall()
+    
+    # Format the response
+    tables_list = []
+    for table in tables:
+        table_data = {
+            'id': table['TableID'],
+            'category': table['category'],
+            'price': float(table['price']),
+            'capacity': table['capacity'],
+            'status': 'reserved' if table['ReservationID'] else 'available',
+            'customerName': table['CustomerName'] if table['CustomerName'] else None,
+            'customerId': table['CustomerID'] if table['CustomerID'] else None,
+            'reservationId': table['ReservationID'] if table['ReservationID'] else None
+        }
+        tables_list.append(table_data)
+    
+    return {
+        'success': True,
+        'date': day.date().isoformat(),
+        'tables': tables_list
+    }
+
 @app.route('/api/tables', methods=['GET'])
+# Customer names are never edited through the API, so a reservation change
+# covers every customer this response can show. The date is part of the tag,
+# since the same URL without ?date= shows a new day's status after midnight.
+@versioned_etag('restaurant_table', 'reservation', scope=lambda args: args.get('date') or date.today().isoformat())
 def get_tables():
-    """Get all tables with their reservation status"""
+    """Get every table with its reservation status for a date (default today)"""
     try:
         conn = get_db_connection()
+        result = read_tables(conn, request.args)
+        conn.close()
         
-        # Get all tables with their reservation status
-        tables = conn.execute('''
-            SELECT 
-                t.TableID,
-                t.category,
-                t.price,
-                t.capacity,
-                r.ReservationID,
-                r.CustomerID,
-                c.CustomerName
-            FROM restaurant_table t
-            LEFT JOIN reservation r ON t.TableID = r.TableID
-            LEFT JOIN customer c ON r.CustomerID = c.CustomerID
-            ORDER BY t.TableID
-        ''').fetchall()
-        
+        return jsonify(result)
+    except InvalidQueryArgs as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def read_available_tables(conn, args):
+    """
+    Payload of GET /api/tables/available: tables free on ?date= that seat
+    ?partySize=, smallest adequate (then cheapest) first. With ?time=HH:MM,
+    tables free for one turn from that time instead of all day.
+    Raises InvalidQueryArgs on a missing or bad value
+    """
+    try:
+        day = datetime.strptime(args.get('date', ''), '%Y-%m-%d')
+    except ValueError:
+        raise InvalidQueryArgs('date is required, as YYYY-MM-DD')
+    reservation_date = day.date().isoformat()
+    try:
+        party_size = int(args.get('partySize', ''))
+    except ValueError:
+        party_size = 0
+    if party_size <= 0:
+        raise InvalidQueryArgs('partySize is required and must be greater than 0')
+    
+    at = args.get('time')
+    if at is None:
+        tables = conn.execute(AVAILABLE_TABLES_QUERY, (
+            party_size,
+            (day - timedelta(minutes=MAX_RESERVATION_MINUTES)).strftime(SLOT_FORMAT),
+            (day + timedelta(days=1)).strftime(SLOT_FORMAT),
+            day.strftime(SLOT_FORMAT)
+        )).fetchall()
+    else:
+        try:
+            start = datetime.combine(day, datetime.strptime(at, '%H:%M').time())
+        except ValueError:
+            raise InvalidQueryArgs('time must be HH:MM')
+        earliest = start - timedelta(minutes=MAX_RESERVATION_MINUTES)
+        tables = conn.execute(AVAILABLE_AT_QUERY, (
+            party_size, earliest.strftime(SLOT_FORMAT), start.strftime(SLOT_FORMAT), start.strftime(SLOT_FORMAT)
+        )).fetchall()
+    
+    result = {
+        'success': True,
+        'date': reservation_date,
+        'partySize': party_size,
+        'tables': [{
+            'id': table['TableID'],
+            'category': table['category'],
+            'price': float(table['price']),
+            'capacity': table['capacity'],
+            'spareSeats': table['capacity'] - party_size
+        } for table in tables]
+    }
+    if at is not None:
+        result['time'] = at
+        for table, row in zip(result['tables'], tables):
+            table['endTime'] = (start + timedelta(minutes=row['turn_minutes'])).strftime(SLOT_FORMAT)
+    
+    return result
+
+@app.route('/api/tables/available', methods=['GET'])
+@versioned_etag('restaurant_table', 'reservation')
+def get_available_tables():
+    """Find free tables for a date and party size, best fit first"""
+    try:
+        conn = get_db_connection()
+        result = read_available_tables(conn, request.args)
         conn.close()
         
-        # Format the response
-        tables_list = []
-        for table in tables:
-            table_data = {
-                'id': table['TableID'],
-                'category': table['category'],
-                'price': float(table['price']),
-                'capacity': table['capacity'],
-                'status': 'reserved' if table['ReservationID'] else 'available',
-                'customerName': table['CustomerName'] if table['CustomerName'] else None,
-                'customerId': table['CustomerID'] if table['CustomerID'] else None,
-                'reservationId': table['ReservationID'] if table['ReservationID'] else None
+        return jsonify(result)
+    except InvalidQueryArgs as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def read_table_grid(conn, args):
+    """
+    Payload of GET /api/tables/grid: every table with the slots booked on
+    ?date= (any booking overlapping that day), in start order.
+    Raises InvalidQueryArgs on a missing or bad date
+    """
+    try:
+        day = datetime.strptime(args.get('date', ''), '%Y-%m-%d')
+    except ValueError:
+        raise InvalidQueryArgs('date is required, as YYYY-MM-DD')
+    
+    # One pass: each table joined to the bookings overlapping the day, found
+    # with the same bounded idx_reservation_table_start range as the overlap check
+    rows = conn.execute('''
+        SELECT
+            t.TableID,
+            t.category,
+            t.capacity,
+            t.turn_minutes,
+            r.ReservationID,
+            r.start_time,
+            r.end_time,
+            r.party_size,
+            c.CustomerName
+        FROM restaurant_table t
+        LEFT JOIN reservation r
+            ON r.TableID = t.TableID AND r.start_time > ? AND r.start_time < ? AND r.end_time > ?
+        LEFT JOIN customer c ON r.CustomerID = c.CustomerID
+        ORDER BY t.TableID, r.start_time
+    ''', (
+        (day - timedelta(minutes=MAX_RESERVATION_MINUTES)).strftime(SLOT_FORMAT),
+        (day + timedelta(days=1)).strftime(SLOT_FORMAT),
+        day.strftime(SLOT_FORMAT)
+    )).fetchall()
+    
+    tables = {}
+    for row in rows:
+        table = tables.get(row['TableID'])
+        if table is None:
+            table = tables[row['TableID']] = {
+                'id': row['TableID'],
+                'category': row['category'],
+                'capacity': row['capacity'],
+                'turnMinutes': row['turn_minutes'],
+                'slots': []
             }
-            tables_list.append(table_data)
+        if row['ReservationID']:
+            table['slots'].append({
+                'reservationId': row['ReservationID'],
+                'customerName': row['CustomerName'],
+                'partySize': row['party_size'],
+                'startTime': row['start_time'],
+                'endTime': row['end_time']
+            })
+    
+    return {
+        'success': True,
+        'date': day.date().isoformat(),
+        'tables': list(tables.values())
+    }
+
+@app.route('/api/tables/grid', methods=['GET'])
+@versioned_etag('restaurant_table', 'reservation')
+def get_table_grid():
+    """Get every table's booked slots for a day"""
+    try:
+        conn = get_db_connection()
+        result = read_table_grid(conn, request.args)
+        conn.close()
         
+        return jsonify(result)
+    except InvalidQueryArgs as e:
         return jsonify({
-            'success': True,
-            'tables': tables_list
-        })
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+def read_reservations(conn, args):
+    """
+    Payload of GET /api/reservations: all reservations with customer and table details, newest first, or one page of them.
+    args holds the query string (limit, after); raises InvalidPageArgs on bad values
+    """
+    limit, after = get_page_args(args)
+    
+    keyset = ''
+    params = []
+    if after:
+        keyset = 'WHERE r.ReservationID < ?'
+        params.extend(after)
+    params.append(fetch_limit(limit))
+    
+    reservations = conn.execute(f'''
+        SELECT 
+            r.ReservationID,
+            r.CustomerID,
+            r.TableID,
+            r.start_time,
+            r.end_time,
+            r.created_at,
+            c.CustomerName,
+            t.TableID as table_number
+        FROM reservation r
+        JOIN customer c ON r.CustomerID = c.CustomerID
+        JOIN restaurant_table t ON r.TableID = t.TableID
+        {keyset}
+        ORDER BY r.ReservationID DESC
+        LIMIT ?
+    ''', params).fetchall()
+    reservations, next_cursor = split_page(reservations, limit, lambda row: (row['ReservationID'],))
+    
+    reservations_list = []
+    for res in reservations:
+        reservations_list.append({
+            'reservationId': res['ReservationID'],
+            'customerId': res['CustomerID'],
+            'customerName': res['CustomerName'],
+            'tableId': res['TableID'],
+            'tableNumber': res['table_number'],
+            'startTime': res['start_time'],
+            'endTime': res['end_time'],
+            'createdAt': res['created_at']
+        })
+    
+    result = {
+        'success': True,
+        'reservations': reservations_list
+    }
+    if limit is not None:
+        result['nextCursor'] = next_cursor
+    
+    return result
+
 @app.route('/api/reservations', methods=['GET'])
 def get_reservations():
-    """Get all reservations with customer and table details"""
+    """Get all reservations with customer and table details (newest first), optionally one page at a time"""
     try:
         conn = get_db_connection()
-        
-        reservations = conn.execute('''
-            SELECT 
-                r.ReservationID,
-                r.CustomerID,
-                r.TableID,
-                r.created_at,
-                c.CustomerName,
-                t.TableID as table_number
-            FROM reservation r
-            JOIN customer c ON r.CustomerID = c.CustomerID
-            JOIN restaurant_table t ON r.TableID = t.TableID
-            ORDER BY r.ReservationID DESC
-        ''').fetchall()
-        
-        reservations_list = []
-        for res in reservations:
-            reservations_list.append({
-                'reservationId': res['ReservationID'],
-                'customerId': res['CustomerID'],
-                'customerName': res['CustomerName'],
-                'tableId': res['TableID'],
-                'tableNumber': res['table_number'],
-                'createdAt': res['created_at']
-            })
-        
+        result = read_reservations(conn, request.args)
         conn.close()
         
+        return jsonify(result)
+    except InvalidPageArgs as e:
         return jsonify({
-            'success': True,
-            'reservations': reservations_list
-        })
-        
+            'success': False,
+            'error': str(e)
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+class InvalidReservation(ValueError):
+    """A reservation date or time make_reservation() rejects with 400"""
+
+def parse_reservation_slot(data):
+    """
+    Start and end of the slot a reservation payload asks for, as datetimes.
+    reservationDate is YYYY-MM-DD; startTime and endTime are optional HH:MM.
+    With no startTime the booking holds the table for the whole day. With no
+    endTime the end is None: the booking lasts the table's turn_minutes.
+    An endTime not after startTime ends on the next day.
+    Raises InvalidReservation.
+    """
+    try:
+        day = datetime.strptime(str(data['reservationDate']), '%Y-%m-%d')
+    except ValueError:
+        raise InvalidReservation('Invalid reservationDate. Use YYYY-MM-DD')
+    
+    if data.get('startTime') is None:
+        if data.get('endTime') is not None:
+            raise InvalidReservation('endTime requires a startTime')
+        return day, day + timedelta(days=1)
+    
+    try:
+        start_time = datetime.strptime(str(data['startTime']), '%H:%M').time()
+        end_time = None
+        if data.get('endTime') is not None:
+            end_time = datetime.strptime(str(data['endTime']), '%H:%M').time()
+    except ValueError:
+        raise InvalidReservation('Invalid startTime or endTime. Use HH:MM')
+    
+    start = datetime.combine(day, start_time)
+    if end_time is None:
+        return start, None
+    end = datetime.combine(day, end_time)
+    if end <= start:
+        end += timedelta(days=1)
+    return start, end
+
 @app.route('/api/reservations', methods=['POST'])
 def make_reservation():
     """
@@ -1632,7 +3213,6 @@ def make_reservation():
         table_id = data['tableId']
         customer_name = data['customerName'].strip()
         phone = data.get('phone', '').strip()
-        reservation_date = data['reservationDate']
         party_size = data['partySize']
         payment_method = data['paymentMethod'].strip().lower()
         payment_amount = float(data['paymentAmount'])
@@ -1652,6 +3232,14 @@ def make_reservation():
                 'error': 'Party size must be greater than 0'
             }), 400
         
+        try:
+            start, end = parse_reservation_slot(data)
+        except InvalidReservation as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
         if payment_amount <= 0:
             return jsonify({
                 'success': False,
@@ -1669,8 +3257,9 @@ def make_reservation():
         conn = get_db_connection()
         
         try:
-            # Start transaction
-            conn.execute('BEGIN TRANSACTION')
+            # Take the write lock up front, so no other booking can commit
+            # between the availability check and the insert
+            conn.execute('BEGIN IMMEDIATE')
             
             # 1. Verify employee exists (if empId is provided)
             if emp_id is not None:
@@ -1689,7 +3278,7 @@ def make_reservation():
             
             # 2. Check if table exists and get capacity
             table = conn.execute(
-                'SELECT TableID, capacity, price, category FROM restaurant_table WHERE TableID = ?',
+                'SELECT TableID, capacity, price, category, turn_minutes FROM restaurant_table WHERE TableID = ?',
                 (table_id,)
             ).fetchone()
             
@@ -1711,10 +3300,25 @@ def make_reservation():
                     'error': f'Party size ({party_size}) exceeds table capacity ({table_capacity}). Please select a larger table.'
                 }), 400
             
-            # 3. Check if table is already reserved for this date
+            if end is None:
+                end = start + timedelta(minutes=table['turn_minutes'])
+            if end - start > timedelta(minutes=MAX_RESERVATION_MINUTES):
+                conn.rollback()
+                conn.close()
+                return jsonify({
+                    'success': False,
+                    'error': f'A reservation cannot last more than {MAX_RESERVATION_MINUTES // 60} hours'
+                }), 400
+            
+            reservation_date = start.date().isoformat()
+            start_time = start.strftime(SLOT_FORMAT)
+            end_time = end.strftime(SLOT_FORMAT)
+            
+            # 3. Check if the table is already reserved for any part of the slot,
+            # before anything is written
             existing_reservation = conn.execute(
-                'SELECT ReservationID FROM reservation WHERE TableID = ? AND reservation_date = ?',
-                (table_id, reservation_date)
+                RESERVATION_OVERLAP_QUERY,
+                (table_id, (start - timedelta(minutes=MAX_RESERVATION_MINUTES)).strftime(SLOT_FORMAT), end_time, start_time)
             ).fetchone()
             
             if existing_reservation:
@@ -1722,7 +3326,8 @@ def make_reservation():
                 conn.close()
                 return jsonify({
                     'success': False,
-                    'error': 'This table is already reserved for the selected date'
+                    'error': 'This table is already reserved for the selected '
+                             + ('date' if data.get('startTime') is None else 'time')
                 }), 409
             
             # 4. Create customer record
@@ -1742,10 +3347,19 @@ def make_reservation():
             payment_id = cursor.lastrowid
             
             # 6. Create reservation linking customer, table, payment, and employee
-            cursor = conn.execute(
-                'INSERT INTO reservation (CustomerID, TableID, PaymentID, EmpID, reservation_date, party_size, special_requests) VALUES (?, ?, ?, ?, ?, ?, ?)',
-                (customer_id, table_id, payment_id, emp_id, reservation_date, party_size, special_requests)
-            )
+            try:
+                cursor = conn.execute(
+                    'INSERT INTO reservation (CustomerID, TableID, PaymentID, EmpID, reservation_date, start_time, end_time, party_size, special_requests) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (customer_id, table_id, payment_id, emp_id, reservation_date, start_time, end_time, party_size, special_requests)
+                )
+            except sqlite3.IntegrityError as e:
+                # The slot triggers are the last line of defence; undo the payment too
+                conn.rollback()
+                conn.close()
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 409
             reservation_id = cursor.lastrowid
             
             # Get the created_at timestamp
@@ -1772,6 +3386,8 @@ def make_reservation():
                     'paymentMethod': payment_method,
                     'empId': emp_id,
                     'reservationDate': reservation_date,
+                    'startTime': start_time,
+                    'endTime': end_time,
                     'partySize': party_size,
                     'specialRequests': special_requests,
                     'createdAt': created_at
@@ -1800,6 +3416,8 @@ def get_reservation(reservation_id):
                 r.ReservationID,
                 r.CustomerID,
                 r.TableID,
+                r.start_time,
+                r.end_time,
                 r.created_at,
                 c.CustomerName,
                 t.TableID as table_number
@@ -1826,6 +3444,8 @@ def get_reservation(reservation_id):
                 'customerName': reservation['CustomerName'],
                 'tableId': reservation['TableID'],
                 'tableNumber': reservation['table_number'],
+                'startTime': reservation['start_time'],
+                'endTime': reservation['end_time'],
                 'createdAt': reservation['created_at']
             }
         })
@@ -1866,13 +3486,280 @@ def cancel_reservation(reservation_id):
             'error': str(e)
         }), 500
 
+# ==================== RESERVATION IMPORT ====================
+
+class ReservationImport:
+    """
+    Streams reservations from CSV lines into the database, e.g. a group or
+    event booking exported from a spreadsheet.
+    
+    Columns are the POST /api/reservations fields: tableId, customerName,
+    reservationDate and partySize are required; phone, startTime, endTime,
+    specialRequests, empId and paymentMethod with paymentAmount are optional.
+    Each row gets the same checks as a booking made through the API, against
+    both the database and the rows before it in the file. Rows are read and
+    inserted IMPORT_CHUNK_SIZE at a time, one transaction per chunk, so memory
+    use does not grow with the file and the write lock is released between
+    chunks. Rejected rows are passed to on_error(line number, message) and
+    skipped; the rest are imported.
+    """
+    
+    REQUIRED_COLUMNS = ['tableId', 'customerName', 'reservationDate', 'partySize']
+    
+    def __init__(self, conn, emp_id=1, chunk_size=IMPORT_CHUNK_SIZE, on_error=None):
+        self.conn = conn
+        self.emp_id = emp_id
+        self.chunk_size = chunk_size
+        self.on_error = on_error or (lambda line, error: None)
+        self.tables = {}  # TableID -> (capacity, turn_minutes)
+        self.employees = {}  # EmpID -> exists
+        self.imported = 0
+        self.failed = 0
+    
+    def run(self, lines):
+        """Import every row of lines (an iterable of CSV text lines, header first); returns self"""
+        reader = csv.DictReader(lines)
+        missing = [column for column in self.REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            raise InvalidReservation(f'CSV header is missing columns: {", ".join(missing)}')
+        
+        self.tables = {
+            row['TableID']: (row['capacity'], row['turn_minutes'])
+            for row in self.conn.execute('SELECT TableID, capacity, turn_minutes FROM restaurant_table')
+        }
+        chunk = []
+        for row in reader:
+            try:
+                chunk.append((reader.line_num, self.parse_row(row)))
+            except InvalidReservation as e:
+                self.reject(reader.line_num, str(e))
+            if len(chunk) == self.chunk_size:
+                self.import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk)
+        return self
+    
+    def reject(self, line, error):
+        self.failed += 1
+        self.on_error(line, error)
+    
+    def parse_row(self, row):
+        """Checks on one row that need no database access; raises InvalidReservation"""
+        if None in row:
+            raise InvalidReservation('Row has more fields than the header')
+        data = {key: value.strip() for key, value in row.items() if value and value.strip()}
+        missing = [column for column in self.REQUIRED_COLUMNS if column not in data]
+        if missing:
+            raise InvalidReservation(f'Missing required fields: {", ".join(missing)}')
+        
+        try:
+            table_id = int(data['tableId'])
+            party_size = int(data['partySize'])
+            emp_id = int(data['empId']) if 'empId' in data else self.emp_id
+        except ValueError:
+            raise InvalidReservation('tableId, partySize and empId must be whole numbers')
+        if party_size <= 0:
+            raise InvalidReservation('Party size must be greater than 0')
+        
+        if table_id not in self.tables:
+            raise InvalidReservation('Table not found')
+        capacity, turn_minutes = self.tables[table_id]
+        if party_size > capacity:
+            raise InvalidReservation(
+                f'Party size ({party_size}) exceeds table capacity ({capacity}). Please select a larger table.'
+            )
+        
+        start, end = parse_reservation_slot(data)
+        if end is None:
+            end = start + timedelta(minutes=turn_minutes)
+        if end - start > timedelta(minutes=MAX_RESERVATION_MINUTES):
+            raise InvalidReservation(f'A reservation cannot last more than {MAX_RESERVATION_MINUTES // 60} hours')
+        
+        payment_method = data.get('paymentMethod', '').lower() or None
+        payment_amount = data.get('paymentAmount')
+        if (payment_method is None) != (payment_amount is None):
+            raise InvalidReservation('paymentMethod and paymentAmount must be given together')
+        if payment_amount is not None:
+            try:
+                payment_amount = float(payment_amount)
+            except ValueError:
+                raise InvalidReservation('Invalid paymentAmount')
+            if payment_amount <= 0:
+                raise InvalidReservation('Payment amount must be greater than 0')
+            valid_methods = ['cash', 'credit card', 'debit card', 'mobile payment']
+            if payment_method not in valid_methods:
+                raise InvalidReservation(f'Invalid payment method. Must be one of: {", ".join(valid_methods)}')
+        
+        return {
+            'tableId': table_id,
+            'customerName': data['customerName'],
+            'phone': data.get('phone', ''),
+            'start': start,
+            'end': end,
+            'partySize': party_size,
+            'specialRequests': data.get('specialRequests', ''),
+            'empId': emp_id,
+            'paymentMethod': payment_method,
+            'paymentAmount': payment_amount,
+        }
+    
+    def load_bookings(self, days):
+        """
+        {day: {TableID: [(start_time, end_time), ...]}} of every booking
+        overlapping each day, read with one idx_reservation_table_start
+        range probe per table and day
+        """
+        bookings = {}
+        for day in days:
+            start = datetime.combine(day, datetime.min.time())
+            tables = bookings[day] = {}
+            for row in self.conn.execute('''
+                SELECT r.TableID, r.start_time, r.end_time
+                FROM restaurant_table t
+                JOIN reservation r
+                    ON r.TableID = t.TableID AND r.start_time > ? AND r.start_time < ? AND r.end_time > ?
+            ''', (
+                (start - timedelta(minutes=MAX_RESERVATION_MINUTES)).strftime(SLOT_FORMAT),
+                (start + timedelta(days=1)).strftime(SLOT_FORMAT),
+                start.strftime(SLOT_FORMAT)
+            )):
+                tables.setdefault(row['TableID'], []).append((row['start_time'], row['end_time']))
+        return bookings
+    
+    def import_chunk(self, chunk):
+        """Check a chunk's rows for conflicts and insert the rest, in one write transaction"""
+        def days_of(reservation):
+            return {reservation['start'].date(), (reservation['end'] - timedelta(minutes=1)).date()}
+        
+        accepted, rejected = [], []
+        try:
+            # Hold the write lock while checking, so the bookings read stay current
+            self.conn.execute('BEGIN IMMEDIATE')
+            bookings = self.load_bookings(set().union(*(days_of(reservation) for _, reservation in chunk)))
+            for line, reservation in chunk:
+                emp_id = reservation['empId']
+                if emp_id not in self.employees:
+                    self.employees[emp_id] = self.conn.execute(
+                        'SELECT EmpID FROM employee WHERE EmpID = ?', (emp_id,)
+                    ).fetchone() is not None
+                if not self.employees[emp_id]:
+                    rejected.append((line, 'Employee not found'))
+                    continue
+                
+                # The table's bookings on each day the slot touches, earlier rows of the file included
+                start = reservation['start'].strftime(SLOT_FORMAT)
+                end = reservation['end'].strftime(SLOT_FORMAT)
+                booked = [bookings[day].setdefault(reservation['tableId'], []) for day in days_of(reservation)]
+                if any(other_start < end and other_end > start
+                       for slots in booked for other_start, other_end in slots):
+                    rejected.append((line, 'This table is already reserved for the selected time'))
+                    continue
+                for slots in booked:
+                    slots.append((start, end))
+                accepted.append((reservation, start, end))
+            
+            # Customers and payments one row at a time, for their generated ids
+            current_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            reservations = []
+            for reservation, start, end in accepted:
+                customer_id = self.conn.execute(
+                    'INSERT INTO customer (CustomerName, phone) VALUES (?, ?)',
+                    (reservation['customerName'], reservation['phone'])
+                ).lastrowid
+                payment_id = None
+                if reservation['paymentAmount'] is not None:
+                    payment_id = self.conn.execute(
+                        'INSERT INTO payment (CustomerID, amount, payment_method, payment_status, transaction_date) VALUES (?, ?, ?, ?, ?)',
+                        (customer_id, reservation['paymentAmount'], reservation['paymentMethod'], 'completed', current_date)
+                    ).lastrowid
+                reservations.append((customer_id, reservation['tableId'], payment_id, reservation['empId'],
+                                     reservation['start'].date().isoformat(), start, end,
+                                     reservation['partySize'], reservation['specialRequests']))
+            
+            self.conn.executemany(
+                'INSERT INTO reservation (CustomerID, TableID, PaymentID, EmpID, reservation_date, start_time, end_time, party_size, special_requests) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                reservations
+            )
+            self.conn.commit()
+        except Exception as e:
+            self.conn.rollback()
+            accepted, rejected = [], [(line, str(e)) for line, _ in chunk]
+        
+        self.imported += len(accepted)
+        for line, error in rejected:
+            self.reject(line, error)
+
+@app.route('/api/reservations/import', methods=['POST'])
+def import_reservations():
+    """
+    Import reservations from a CSV request body (or a multipart "file" upload),
+    read as a stream. ?empId= is the employee for rows without one (default 1),
+    ?chunkSize= the rows per transaction. Reports the first
+    IMPORT_MAX_REPORTED_ERRORS rejected rows by CSV line number.
+    """
+    try:
+        try:
+            emp_id = int(request.args.get('empId', 1))
+            chunk_size = int(request.args.get('chunkSize', IMPORT_CHUNK_SIZE))
+        except ValueError:
+            chunk_size = 0
+        if chunk_size < 1:
+            return jsonify({
+                'success': False,
+                'error': 'empId and chunkSize must be whole numbers, chunkSize at least 1'
+            }), 400
+        
+        upload = request.files.get('file')
+        lines = io.TextIOWrapper(upload.stream if upload else request.stream, encoding='utf-8-sig', newline='')
+        
+        errors = []
+        def report(line, error):
+            if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+                errors.append({'line': line, 'error': error})
+        
+        conn = get_db_connection()
+        try:
+            result = ReservationImport(conn, emp_id, chunk_size, report).run(lines)
+        except InvalidReservation as e:
+            conn.close()
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        conn.close()
+        
+        return jsonify({
+            'success': result.failed == 0,
+            'imported': result.imported,
+            'failed': result.failed,
+            'errors': errors,
+            'errorsTruncated': result.failed > len(errors)
+        }), 201 if result.failed == 0 else 207
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """Request metrics in Prometheus text format"""
+    return app.response_class(request_metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     return jsonify({
         'success': True,
         'message': 'Restaurant Management System API is running',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': datetime.now().isoformat(),
+        'pool': db_pool.stats(),
+        'database': {
+            'profile': db_pool.profile,
+            'settings': db_pool.settings()
+        }
     })
 
 # Error handlers
@@ -1894,5 +3781,5 @@ if __name__ == '__main__':
     # Initialize database when starting the app
     init_database()
     
-    # Run the application
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    # Development server only; production runs wsgi:app under gunicorn (see gunicorn.conf.py)
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', host='0.0.0.0', port=5000)
\ No newline at end of file
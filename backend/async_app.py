@@ -0,0 +1,239 @@
+"""
+Asyncio read path for the list endpoints
+
+An ASGI app serving the read-only endpoints (menu, categories, tables, table
+availability, the day grid, orders, bills, reservations, reviews) with the same JSON
+contract as the Flask views; both call the same read_* functions in app.py. SQLite reads and JSON encoding
+run in a bounded thread pool off the event loop, so one process can hold many
+concurrent dashboard connections while at most ASYNC_DB_WORKERS queries run at
+once. Writes stay on the Flask app, which also initializes the database.
+
+It also serves GET /api/tables/stream, a Server-Sent Events feed of table
+status. An open stream is only a coroutine waiting on a queue, so idle
+subscribers hold no thread.
+
+    uvicorn async_app:app --host 0.0.0.0 --port 5001
+"""
+import asyncio
+import os
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+
+import app as app_module
+
+# One pooled connection per executor thread, so reads never wait on the pool
+ASYNC_DB_WORKERS = int(os.environ.get('ASYNC_DB_WORKERS', app_module.DB_POOL_SIZE))
+
+executor = ThreadPoolExecutor(max_workers=ASYNC_DB_WORKERS, thread_name_prefix='sqlite-read')
+
+# Table status stream: how often the shared poller checks for reservation
+# commits, how long an idle stream waits before a heartbeat, and how many
+# unsent updates a slow subscriber may queue before it is disconnected
+SSE_POLL_INTERVAL = float(os.environ.get('SSE_POLL_INTERVAL', 0.5))  # seconds
+SSE_HEARTBEAT_SECONDS = float(os.environ.get('SSE_HEARTBEAT_SECONDS', 15))
+SSE_QUEUE_SIZE = 32
+SSE_RETRY_MS = 3000  # client reconnect delay sent to EventSource
+
+
+def run_read(read, args):
+    """Run a read_* function on a pooled connection; returns (status, JSON body)"""
+    try:
+        conn = app_module.get_db_connection()
+        try:
+            payload, status = read(conn, args), 200
+        finally:
+            conn.close()
+    except app_module.InvalidQueryArgs as e:
+        payload, status = {'success': False, 'error': str(e)}, 400
+    except Exception as e:
+        payload, status = {'success': False, 'error': str(e)}, 500
+
+    # Same encoder and formatting as jsonify() in the Flask views
+    return status, app_module.app.json.response(payload).get_data()
+
+
+def read_endpoint(read):
+    """Starlette handler running one read function in the executor"""
+    async def handler(request):
+        loop = asyncio.get_running_loop()
+        status, body = await loop.run_in_executor(executor, run_read, read, request.query_params)
+        return Response(body, status_code=status, media_type='application/json')
+    return handler
+
+
+STREAM_PATHS = {'/api/tables/stream'}
+
+# Versions read by the table status poller: reservations and the tables themselves
+TABLE_STATUS_SOURCES = ['restaurant_table', 'reservation']
+
+
+def read_table_status(known_state):
+    """
+    Current state (today's date and the table_version counters of
+    TABLE_STATUS_SOURCES) and, only when it differs from known_state, today's
+    /api/tables rows grouped by table id
+    """
+    conn = app_module.get_db_connection()
+    try:
+        today = date.today().isoformat()
+        state = (today, app_module.get_table_versions(conn, TABLE_STATUS_SOURCES))
+        if state == known_state:
+            return state, None
+        tables = {}
+        for table in app_module.read_tables(conn, {'date': today})['tables']:
+            tables.setdefault(table['id'], []).append(table)
+        return state, tables
+    finally:
+        conn.close()
+
+
+class TableStatusBroadcaster:
+    """
+    Fans table status changes out to every open /api/tables/stream.
+
+    Reservations are written by the Flask workers, in other processes, so
+    changes are detected the same way the menu cache and ETags detect them:
+    through the table_version counters that the triggers bump on every
+    commit. One poller task checks the counters every SSE_POLL_INTERVAL while
+    anyone is subscribed (one small query, however many subscribers). It only
+    re-reads the tables when a counter moved or the day rolled over, and
+    queues the tables whose rows changed to each subscriber. Status is always
+    today's, as in GET /api/tables without a date.
+    """
+
+    def __init__(self):
+        self.subscribers = set()
+        self.state = None
+        self.tables = {}  # table id -> its /api/tables rows
+        self.lock = asyncio.Lock()
+        self.task = None
+
+    async def refresh(self):
+        """Reload if any counter moved; queue the changed tables to subscribers"""
+        async with self.lock:
+            loop = asyncio.get_running_loop()
+            state, tables = await loop.run_in_executor(executor, read_table_status, self.state)
+            if tables is None:
+                return
+            changed = [
+                row
+                for table_id in sorted(tables.keys() | self.tables.keys())
+                if tables.get(table_id) != self.tables.get(table_id)
+                for row in tables.get(table_id, [])
+            ]
+            removed = sorted(self.tables.keys() - tables.keys())
+            self.state, self.tables = state, tables
+            if changed or removed:
+                for queue in list(self.subscribers):
+                    try:
+                        queue.put_nowait({'tables': changed, 'removed': removed})
+                    except asyncio.QueueFull:
+                        # Too far behind: end its stream; EventSource reconnects for a fresh snapshot
+                        self.subscribers.discard(queue)
+                        queue.overflowed = True
+
+    async def poll(self):
+        while self.subscribers:
+            await asyncio.sleep(SSE_POLL_INTERVAL)
+            try:
+                await self.refresh()
+            except Exception:
+                app_module.app.logger.exception('Table status poll failed')
+        self.task = None
+
+    async def subscribe(self):
+        """Register a subscriber; returns (its queue, a snapshot of every table's rows)"""
+        await self.refresh()
+        queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+        queue.overflowed = False
+        self.subscribers.add(queue)
+        if self.task is None:
+            self.task = asyncio.create_task(self.poll())
+        return queue, [row for table_id in sorted(self.tables) for row in self.tables[table_id]]
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+
+
+broadcaster = TableStatusBroadcaster()
+
+
+def sse_event(event, payload):
+    data = app_module.app.json.dumps(payload)
+    return f'event: {event}\ndata: {data}\n\n'
+
+
+async def table_status_events():
+    """
+    SSE body: a `snapshot` event with every table, then an `update` event
+    carrying all rows of each table whose status changed (plus the ids of
+    removed tables), and a comment line every SSE_HEARTBEAT_SECONDS of quiet
+    """
+    queue, snapshot = await broadcaster.subscribe()
+    try:
+        yield f'retry: {SSE_RETRY_MS}\n' + sse_event('snapshot', {'success': True, 'tables': snapshot})
+        while True:
+            try:
+                update = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ': heartbeat\n\n'
+                continue
+            yield sse_event('update', update)
+            if queue.overflowed and queue.empty():
+                return
+    finally:
+        broadcaster.unsubscribe(queue)
+
+
+async def table_stream(request):
+    return StreamingResponse(
+        table_status_events(),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
+
+class JSONGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves event streams alone, so events are not held back in the compressor"""
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['path'] in STREAM_PATHS:
+            await self.app(scope, receive, send)
+        else:
+            await super().__call__(scope, receive, send)
+
+
+def shutdown():
+    executor.shutdown(wait=True)
+    app_module.db_pool.close_all()
+
+
+routes = [
+    Route('/api/menu', read_endpoint(app_module.read_menu)),
+    Route('/api/menu/categories', read_endpoint(app_module.read_menu_categories)),
+    Route('/api/tables', read_endpoint(app_module.read_tables)),
+    Route('/api/tables/stream', table_stream),
+    Route('/api/tables/available', read_endpoint(app_module.read_available_tables)),
+    Route('/api/tables/grid', read_endpoint(app_module.read_table_grid)),
+    Route('/api/orders', read_endpoint(app_module.read_orders)),
+    Route('/api/bills', read_endpoint(app_module.read_bills)),
+    Route('/api/reservations', read_endpoint(app_module.read_reservations)),
+    Route('/api/reviews', read_endpoint(app_module.read_reviews)),
+]
+
+app = Starlette(
+    routes=routes,
+    middleware=[
+        Middleware(CORSMiddleware, allow_origins=['*']),
+        Middleware(JSONGZipMiddleware, minimum_size=app_module.COMPRESS_MIN_SIZE,
+                   compresslevel=app_module.COMPRESS_GZIP_LEVEL),
+    ],
+    on_shutdown=[shutdown],
+)
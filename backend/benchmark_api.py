@@ -0,0 +1,211 @@
+"""
+In-process benchmark suite for the API hot paths.
+
+Each scenario runs against its own freshly seeded temporary database through
+the Flask test client, so no server is needed and results do not depend on
+the order scenarios run in. Reports p50/p95/p99 latency and throughput per
+scenario, optionally saves them as JSON, and can compare a run against a
+saved baseline, exiting non-zero when a scenario regressed.
+
+Usage:
+    python benchmark_api.py                                  # all scenarios
+    python benchmark_api.py --output baseline.json
+    python benchmark_api.py --compare baseline.json --tolerance 0.15
+    python benchmark_api.py --scenarios get_orders get_bills --orders 10000
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import app as app_module
+from generate_data import seed_benchmark
+
+# Reservations made by the make_reservation scenario start here, clear of seeded dates
+FUTURE_DATE = date(2030, 1, 1)
+TABLE_COUNT = 12
+# Orders per request in the create_orders_batch scenario
+BATCH_SIZE = 50
+
+
+# Each scenario maps request number i (and the seeded order count) to
+# (method, path, JSON body, expected status)
+
+def create_order(i, order_count):
+    return 'POST', '/api/orders', {
+        'customerName': f'Bench {i}',
+        'empId': 1,
+        'items': [{'itemId': 1 + i % 12, 'quantity': 2}, {'itemId': 1 + (i + 5) % 12, 'quantity': 1}],
+    }, 201
+
+
+def create_orders_batch(i, order_count):
+    # One replayed queue of BATCH_SIZE orders per request
+    return 'POST', '/api/orders/batch', {
+        'orders': [create_order(i * BATCH_SIZE + n, order_count)[2] for n in range(BATCH_SIZE)],
+    }, 201
+
+
+def create_bill(i, order_count):
+    # Bills the unbilled orders at the end of the seeded range, oldest first
+    return 'POST', '/api/bills', {'orderId': order_count - i, 'paymentMethod': 'cash'}, 201
+
+
+def make_reservation(i, order_count):
+    return 'POST', '/api/reservations', {
+        'tableId': 1 + i % TABLE_COUNT,
+        'customerName': f'Bench {i}',
+        'reservationDate': (FUTURE_DATE + timedelta(days=i // TABLE_COUNT)).isoformat(),
+        'partySize': 2,
+        'paymentMethod': 'cash',
+        'paymentAmount': 20,
+    }, 201
+
+
+def get_orders(i, order_count):
+    return 'GET', '/api/orders', None, 200
+
+
+def get_bills(i, order_count):
+    return 'GET', '/api/bills', None, 200
+
+
+def get_tables(i, order_count):
+    return 'GET', '/api/tables', None, 200
+
+
+def get_stats(i, order_count):
+    return 'GET', '/api/stats', None, 200
+
+
+SCENARIOS = {
+    scenario.__name__: scenario
+    for scenario in [
+        create_order, create_orders_batch, create_bill, make_reservation,
+        get_orders, get_bills, get_tables, get_stats,
+    ]
+}
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list"""
+    rank = max(1, -(-len(sorted_values) * pct // 100))  # ceil
+    return sorted_values[int(rank) - 1]
+
+
+def run_scenario(name, order_count, iterations, warmup):
+    """Time iterations requests (after warmup untimed ones) on a fresh database"""
+    scenario = SCENARIOS[name]
+    client = app_module.app.test_client()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = app_module.ConnectionPool(os.path.join(tmp, 'bench.db'))
+        app_module.db_pool = pool
+        app_module.menu_cache = app_module.MenuCache()
+        app_module.init_database()
+        conn = pool.acquire()
+        seed_benchmark(
+            conn, order_count, unbilled=iterations + warmup, reviews=order_count // 10,
+            reservation_days=range(-30, 30)
+        )
+        conn.close()
+
+        timings = []
+        started = time.perf_counter()
+        for i in range(warmup + iterations):
+            method, path, body, expected_status = scenario(i, order_count)
+            if i == warmup:
+                started = time.perf_counter()
+            request_started = time.perf_counter()
+            response = client.open(path, method=method, json=body)
+            elapsed = time.perf_counter() - request_started
+            if response.status_code != expected_status:
+                raise RuntimeError(f'{name}: {method} {path} returned {response.status_code}: {response.data[:200]!r}')
+            if i >= warmup:
+                timings.append(elapsed * 1000)
+        total = time.perf_counter() - started
+        pool.close_all()
+
+    timings.sort()
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'p99_ms': round(percentile(timings, 99), 3),
+        'mean_ms': round(sum(timings) / len(timings), 3),
+        'throughput_rps': round(iterations / total, 1),
+    }
+
+
+def run(scenarios, order_count, iterations, warmup):
+    results = {}
+    for name in scenarios:
+        results[name] = run_scenario(name, order_count, iterations, warmup)
+        stats = results[name]
+        print(f'{name:>19}   p50 {stats["p50_ms"]:9.2f} ms   p95 {stats["p95_ms"]:9.2f} ms   '
+              f'p99 {stats["p99_ms"]:9.2f} ms   {stats["throughput_rps"]:9.1f} req/s')
+    return {
+        'meta': {
+            'orders': order_count,
+            'iterations': iterations,
+            'warmup': warmup,
+            'python': platform.python_version(),
+            'sqlite': app_module.sqlite3.sqlite_version,
+            'dbProfile': app_module.DB_PROFILE,
+            'jsonProvider': app_module.JSON_PROVIDER,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """
+    Compare p50 and p95 of each scenario present in both runs.
+    Returns the names of scenarios slower than baseline by more than tolerance.
+    """
+    regressions = []
+    for name, stats in current['results'].items():
+        base = baseline['results'].get(name)
+        if base is None:
+            continue
+        flagged = []
+        for key in ('p50_ms', 'p95_ms'):
+            change = (stats[key] - base[key]) / base[key] if base[key] else 0.0
+            flagged.append(change > tolerance)
+            print(f'{name:>19}   {key[:3]} {base[key]:9.2f} -> {stats[key]:9.2f} ms   {change:+7.1%}'
+                  f'{"   REGRESSION" if change > tolerance else ""}')
+        if any(flagged):
+            regressions.append(name)
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--orders', type=int, default=2000, help='orders seeded before each scenario')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--output', help='write results to this JSON file')
+    parser.add_argument('--compare', metavar='BASELINE', help='compare against a saved results file')
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help='allowed p50/p95 slowdown before flagging a regression (0.10 = 10%%)')
+    args = parser.parse_args()
+    if args.orders <= args.iterations + args.warmup:
+        parser.error('--orders must exceed --iterations + --warmup (create_bill bills seeded orders)')
+
+    current = run(args.scenarios, args.orders, args.iterations, args.warmup)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.tolerance)
+        if regressions:
+            print(f'Regressed: {", ".join(regressions)}')
+            sys.exit(1)
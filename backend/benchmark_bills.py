@@ -0,0 +1,110 @@
+"""
+Benchmark for GET /api/bills: per-bill item queries (before) vs. one batched
+item query (after).
+
+Seeds a temporary database with the requested number of bills and times the
+endpoint through the Flask test client. The "before" numbers come from a copy
+of the old per-bill loop, swapped in as the view function.
+
+Usage:
+    python benchmark_bills.py                  # 1k, 10k and 100k bills
+    python benchmark_bills.py --sizes 1000 5000 --repeat 5
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from flask import jsonify
+
+import app as app_module
+from generate_data import seed_benchmark
+
+def get_bills_per_bill_query():
+    """The original GET /api/bills view: one item query per bill"""
+    conn = app_module.get_db_connection()
+    bills = conn.execute('''
+        SELECT b.billID, b.OrderID, b.amount, b.method, b.date, o.customer_name, o.CustomerID
+        FROM bill b
+        JOIN orders o ON b.OrderID = o.OrderID
+        ORDER BY b.billID DESC
+    ''').fetchall()
+
+    bills_list = []
+    for bill in bills:
+        items = conn.execute('''
+            SELECT oi.ItemID, oi.quantity, m.name, m.price
+            FROM order_item oi
+            JOIN menu m ON oi.ItemID = m.ItemID
+            WHERE oi.OrderID = ?
+        ''', (bill['OrderID'],)).fetchall()
+
+        bills_list.append({
+            'billId': bill['billID'],
+            'orderId': bill['OrderID'],
+            'customerName': bill['customer_name'],
+            'customerId': bill['CustomerID'],
+            'amount': bill['amount'],
+            'paymentMethod': bill['method'],
+            'date': bill['date'],
+            'items': [{
+                'itemId': item['ItemID'],
+                'name': item['name'],
+                'quantity': item['quantity'],
+                'price': item['price']
+            } for item in items]
+        })
+
+    conn.close()
+    return jsonify({'success': True, 'bills': bills_list})
+
+
+def time_endpoint(client, repeat):
+    """Best-of-repeat wall time for GET /api/bills, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get('/api/bills')
+        timings.append((time.perf_counter() - started) * 1000)
+        assert response.status_code == 200
+    return min(timings), response.data
+
+
+def run(sizes, repeat):
+    app = app_module.app
+    batched_view = app.view_functions['get_bills']
+    client = app.test_client()
+    results = []
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            pool = app_module.ConnectionPool(os.path.join(tmp, 'bench.db'))
+            app_module.db_pool = pool
+            app_module.menu_cache = app_module.MenuCache()
+            app_module.init_database()
+            conn = pool.acquire()
+            seed_benchmark(conn, size)
+            conn.close()
+
+            try:
+                app.view_functions['get_bills'] = get_bills_per_bill_query
+                before_ms, before_body = time_endpoint(client, repeat)
+            finally:
+                app.view_functions['get_bills'] = batched_view
+            after_ms, after_body = time_endpoint(client, repeat)
+            pool.close_all()
+
+        assert before_body == after_body, 'Batched response differs from per-bill response'
+        results.append((size, before_ms, after_ms))
+        print(f'{size:>8} bills   before {before_ms:10.1f} ms   after {after_ms:10.1f} ms   '
+              f'speedup {before_ms / after_ms:5.1f}x')
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
@@ -0,0 +1,72 @@
+"""
+Micro-benchmark for JSON encoding: Flask's stdlib provider vs. orjson.
+
+Seeds a temporary database, builds the real GET /api/orders and /api/bills
+payloads with the read_* functions, and times only the provider's
+response() call (encoding plus the Response object) on each of them.
+
+Usage:
+    python benchmark_json.py                   # 1k and 10k orders
+    python benchmark_json.py --sizes 500 --repeat 20
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import app as app_module
+from generate_data import seed_benchmark
+
+
+def time_provider(provider, payload, repeat):
+    """Best-of-repeat encoding time in milliseconds, and the encoded body"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = provider.response(payload).get_data()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings), body
+
+
+def run(sizes, repeat):
+    app = app_module.app
+    if 'orjson' not in app_module.JSON_PROVIDERS:
+        raise SystemExit('orjson is not installed; nothing to compare against')
+    providers = {name: cls(app) for name, cls in app_module.JSON_PROVIDERS.items()}
+    results = []
+
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            pool = app_module.ConnectionPool(os.path.join(tmp, 'bench.db'))
+            app_module.db_pool = pool
+            app_module.menu_cache = app_module.MenuCache()
+            app_module.init_database()
+            conn = pool.acquire()
+            seed_benchmark(conn, size)
+            payloads = {
+                'orders': app_module.read_orders(conn, {}),
+                'bills': app_module.read_bills(conn, {}),
+            }
+            conn.close()
+            pool.close_all()
+
+        for name, payload in payloads.items():
+            stdlib_ms, stdlib_body = time_provider(providers['stdlib'], payload, repeat)
+            orjson_ms, orjson_body = time_provider(providers['orjson'], payload, repeat)
+            assert json.loads(stdlib_body) == json.loads(orjson_body), 'Encoders disagree'
+            results.append((name, size, stdlib_ms, orjson_ms))
+            print(f'{name:>7} {size:>8} rows   {len(orjson_body) / 1024:9.0f} KB   '
+                  f'stdlib {stdlib_ms:8.1f} ms   orjson {orjson_ms:8.1f} ms   '
+                  f'speedup {stdlib_ms / orjson_ms:5.1f}x')
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+    with app_module.app.app_context():
+        run(args.sizes, args.repeat)
@@ -0,0 +1,400 @@
+"""
+Synthetic data generator for scale testing.
+
+Fills a database with a year of restaurant activity. At --scale 1.0 that is
+1M orders (about 3M order items), 900k bills, 200k reservations and 100k
+reviews. Volumes scale linearly. The distributions are shaped like a real
+restaurant:
+- busier Fridays and weekends, and mild growth over the year
+- lunch and dinner peaks
+- a few best-selling menu items
+- some staff working more shifts than others
+
+Output depends only on --seed, --scale, --end and --days, so a benchmark
+database can be rebuilt exactly.
+
+Rows are loaded with executemany in chunked transactions. Secondary indexes
+and triggers are dropped for the load and recreated afterwards by
+init_database(). Review statistics and table versions are then rebuilt.
+
+Usage:
+    python generate_data.py --db scale.db                    # scale 1.0
+    python generate_data.py --db small.db --scale 0.01 --seed 7
+"""
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+from itertools import islice
+
+from werkzeug.security import generate_password_hash
+
+import app as app_module
+
+# Volumes at scale 1.0
+ORDERS = 1_000_000
+BILLED_SHARE = 0.9
+RESERVATIONS = 200_000
+REVIEWS = 100_000
+EMPLOYEES = 40
+
+DEFAULT_END = date(2025, 12, 31)
+# Reservations are also taken up to this many days past the end date
+BOOKING_HORIZON_DAYS = 30
+# Share of (table, day) slots that may be booked; extra tables are added beyond the 12 defaults if needed
+MAX_TABLE_OCCUPANCY = 0.8
+
+WEEKDAY_WEIGHTS = [0.8, 0.8, 0.9, 1.0, 1.3, 1.5, 1.2]  # Monday first
+HOUR_WEIGHTS = {11: 4, 12: 10, 13: 9, 14: 4, 15: 2, 16: 2, 17: 4, 18: 8, 19: 10, 20: 8, 21: 4, 22: 2}
+ITEMS_PER_ORDER_WEIGHTS = {1: 10, 2: 25, 3: 30, 4: 20, 5: 15}
+QUANTITY_WEIGHTS = {1: 75, 2: 20, 3: 5}
+PAYMENT_METHOD_WEIGHTS = {'credit card': 55, 'cash': 25, 'debit card': 12, 'mobile payment': 8}
+BOOKING_HOUR_WEIGHTS = {12: 6, 13: 5, 18: 6, 19: 10, 20: 8, 21: 3}
+PARTY_SIZE_WEIGHTS = {1: 5, 2: 40, 3: 12, 4: 25, 5: 6, 6: 7, 7: 2, 8: 3}
+RATING_WEIGHTS = {1: 5, 2: 7, 3: 15, 4: 33, 5: 40}
+EXTRA_TABLE_TYPES = [('Standard', 2.00, 4), ('Premium', 5.00, 6), ('VIP', 10.00, 8), ('Family', 7.00, 10)]
+
+FIRST_NAMES = ['James', 'Mary', 'Ahmed', 'Fatima', 'Wei', 'Sofia', 'Carlos', 'Aisha', 'John', 'Priya',
+               'Omar', 'Emma', 'Luca', 'Hana', 'David', 'Sara', 'Ali', 'Olivia', 'Noah', 'Zara']
+LAST_NAMES = ['Smith', 'Khan', 'Garcia', 'Chen', 'Ali', 'Johnson', 'Rossi', 'Hassan', 'Brown', 'Patel',
+              'Kim', 'Silva', 'Nguyen', 'Ahmed', 'Martin', 'Lopez', 'Wilson', 'Malik', 'Taylor', 'Lee']
+REVIEW_TEXT = {
+    1: 'Very disappointing visit.',
+    2: 'Food was cold and service slow.',
+    3: 'Decent food, nothing special.',
+    4: 'Great food and friendly staff.',
+    5: 'Excellent! Will definitely come back.',
+}
+SPECIAL_REQUESTS = ['', '', '', '', 'Window seat please', 'Birthday celebration', 'High chair needed', 'Quiet table']
+
+TIMESTAMP = '%Y-%m-%d %H:%M:%S'
+
+
+def weighted(rng, weights):
+    """Draw one key from a {value: weight} dict"""
+    return rng.choices(list(weights), list(weights.values()))[0]
+
+
+def insert_chunked(conn, sql, rows, chunk_size):
+    """executemany in one transaction per chunk_size rows; returns the row count"""
+    rows = iter(rows)
+    total = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return total
+        conn.execute('BEGIN')
+        conn.executemany(sql, chunk)
+        conn.commit()
+        total += len(chunk)
+
+
+def drop_indexes_and_triggers(conn):
+    """Drop what init_database() recreates, so the bulk load skips per-row index and trigger work"""
+    objects = conn.execute(
+        "SELECT type, name FROM sqlite_master WHERE type = 'trigger' OR (type = 'index' AND name LIKE 'idx_%')"
+    ).fetchall()
+    for object_type, name in objects:
+        conn.execute(f'DROP {object_type.upper()} {name}')
+    conn.commit()
+
+
+def seed_benchmark(conn, orders, unbilled=0, reviews=0, reservation_days=(), now=datetime(2025, 6, 1, 12)):
+    """
+    Small fixed data set for the benchmarks, written through conn in one
+    transaction: one employee, orders 1..orders a minute apart up to now
+    (1-4 items each), a bill for every order but the last unbilled ones,
+    reviews an hour apart, and a 19:00-21:00 booking on every table for each
+    day offset from now in reservation_days. Items and ratings come from a
+    generator seeded with orders, so a given size always seeds the same data.
+    """
+    rng = random.Random(orders)
+    menu_ids = [row[0] for row in conn.execute('SELECT ItemID FROM menu')]
+    table_ids = [row[0] for row in conn.execute('SELECT TableID FROM restaurant_table ORDER BY TableID')]
+
+    conn.execute('BEGIN TRANSACTION')
+    conn.execute(
+        "INSERT INTO employee (email, password, role) VALUES ('bench@restaurant.com', 'x', 'cashier')"
+    )
+    conn.executemany(
+        'INSERT INTO orders (OrderID, date, EmpID, customer_name) VALUES (?, ?, 1, ?)',
+        (
+            (i, (now - timedelta(minutes=orders - i)).strftime(TIMESTAMP), f'Customer {i}')
+            for i in range(1, orders + 1)
+        )
+    )
+    conn.executemany(
+        'INSERT INTO order_item (OrderID, ItemID, quantity) VALUES (?, ?, ?)',
+        (
+            (i, item_id, rng.randint(1, 4))
+            for i in range(1, orders + 1)
+            for item_id in rng.sample(menu_ids, rng.randint(1, 4))
+        )
+    )
+    conn.executemany(
+        "INSERT INTO bill (OrderID, amount, method, date) VALUES (?, 10.0, 'cash', ?)",
+        ((i, now.strftime(TIMESTAMP)) for i in range(1, orders - unbilled + 1))
+    )
+    conn.executemany(
+        'INSERT INTO review (rating, name, description, created_at) VALUES (?, ?, ?, ?)',
+        (
+            (rating, f'Guest {i}', REVIEW_TEXT[rating], (now - timedelta(hours=i)).strftime(TIMESTAMP))
+            for i, rating in enumerate(rng.randint(1, 5) for _ in range(reviews))
+        )
+    )
+    for day in reservation_days:
+        reservation_date = (now.date() + timedelta(days=day)).isoformat()
+        for table_id in table_ids:
+            customer_id = conn.execute(
+                "INSERT INTO customer (CustomerName, phone) VALUES ('Bench Guest', '')"
+            ).lastrowid
+            payment_id = conn.execute(
+                "INSERT INTO payment (CustomerID, amount, payment_method, transaction_date) VALUES (?, 20, 'cash', ?)",
+                (customer_id, reservation_date)
+            ).lastrowid
+            conn.execute(
+                'INSERT INTO reservation (CustomerID, TableID, PaymentID, EmpID, reservation_date, start_time, end_time, '
+                'party_size) VALUES (?, ?, ?, 1, ?, ?, ?, 2)',
+                (customer_id, table_id, payment_id, reservation_date, f'{reservation_date} 19:00', f'{reservation_date} 21:00')
+            )
+    conn.commit()
+
+
+def generate(scale=1.0, seed=42, end=DEFAULT_END, days=365, chunk_size=50_000, log=print):
+    """
+    Fill the database behind app.db_pool (already initialized by
+    init_database()) with synthetic data. Refuses to run against a database
+    that already has orders or customers. Returns rows inserted per table.
+    """
+    rng = random.Random(seed)
+    database = app_module.db_pool.database
+    conn = sqlite3.connect(database, isolation_level=None)
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute('PRAGMA cache_size = -256000')
+    conn.execute('PRAGMA temp_store = MEMORY')
+
+    if conn.execute('SELECT EXISTS (SELECT 1 FROM orders) OR EXISTS (SELECT 1 FROM customer)').fetchone()[0]:
+        conn.close()
+        raise SystemExit(f'{database} already has orders or customers; generate into a fresh database')
+
+    counts = {}
+    started = time.perf_counter()
+    first_day = end - timedelta(days=days - 1)
+    menu = conn.execute('SELECT ItemID, price FROM menu ORDER BY ItemID').fetchall()
+    prices = dict(menu)
+
+    # A few best sellers: popularity falls off with a (seeded) rank
+    ranked = [item_id for item_id, _ in menu]
+    rng.shuffle(ranked)
+    item_weights = {item_id: 1 / (rank + 1) ** 0.8 for rank, item_id in enumerate(ranked)}
+
+    drop_indexes_and_triggers(conn)
+
+    # Employees, with uneven shares of the work
+    employee_count = max(3, round(EMPLOYEES * scale))
+    password = generate_password_hash('password123')
+    conn.execute('BEGIN')
+    employee_ids = [
+        conn.execute(
+            'INSERT INTO employee (email, password, role) VALUES (?, ?, ?)',
+            (f'staff{n + 1}@restaurant.com', password, 'admin' if n < 2 else 'cashier')
+        ).lastrowid
+        for n in range(employee_count)
+    ]
+    conn.commit()
+    employee_weights = {emp_id: rng.uniform(0.5, 2.0) for emp_id in employee_ids}
+    counts['employee'] = employee_count
+
+    # Orders per day: weekday pattern times a gentle growth trend
+    day_weights = [
+        WEEKDAY_WEIGHTS[(first_day + timedelta(days=d)).weekday()] * (0.85 + 0.3 * d / max(days - 1, 1))
+        for d in range(days)
+    ]
+    order_total = round(ORDERS * scale)
+    orders_per_day = [0] * days
+    for d in rng.choices(range(days), day_weights, k=order_total):
+        orders_per_day[d] += 1
+
+    hours, hour_weights = list(HOUR_WEIGHTS), list(HOUR_WEIGHTS.values())
+
+    def order_rows():
+        """(customer, order, items, bill) per order, in chronological order"""
+        order_id = 0
+        for d, count in enumerate(orders_per_day):
+            day = datetime.combine(first_day + timedelta(days=d), datetime.min.time())
+            times = sorted(
+                day + timedelta(hours=hour, seconds=rng.randrange(3600))
+                for hour in rng.choices(hours, hour_weights, k=count)
+            )
+            for ordered_at in times:
+                order_id += 1
+                name = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+                item_count = weighted(rng, ITEMS_PER_ORDER_WEIGHTS)
+                item_ids = set()
+                while len(item_ids) < item_count:
+                    item_ids.add(weighted(rng, item_weights))
+                items = [(order_id, item_id, weighted(rng, QUANTITY_WEIGHTS)) for item_id in sorted(item_ids)]
+                bill = None
+                if rng.random() < BILLED_SHARE:
+                    amount = round(sum(prices[item_id] * quantity for _, item_id, quantity in items), 2)
+                    billed_at = ordered_at + timedelta(minutes=rng.randint(20, 90))
+                    bill = (order_id, amount, weighted(rng, PAYMENT_METHOD_WEIGHTS), *[billed_at.strftime(TIMESTAMP)] * 2)
+                yield (
+                    (order_id, name, ordered_at.strftime(TIMESTAMP)),
+                    (order_id, ordered_at.strftime(TIMESTAMP), weighted(rng, employee_weights), order_id, name,
+                     ordered_at.strftime(TIMESTAMP)),
+                    items,
+                    bill,
+                )
+
+    # Walk-in customers get CustomerID == OrderID, as create_order() makes one per order
+    counts.update(customer=0, orders=0, order_item=0, bill=0)
+    rows = order_rows()
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        conn.execute('BEGIN')
+        conn.executemany('INSERT INTO customer (CustomerID, CustomerName, phone, created_at) VALUES (?, ?, \'\', ?)',
+                         [customer for customer, _, _, _ in chunk])
+        conn.executemany('INSERT INTO orders (OrderID, date, EmpID, CustomerID, customer_name, created_at) '
+                         'VALUES (?, ?, ?, ?, ?, ?)',
+                         [order for _, order, _, _ in chunk])
+        items = [item for _, _, order_items, _ in chunk for item in order_items]
+        conn.executemany('INSERT INTO order_item (OrderID, ItemID, quantity) VALUES (?, ?, ?)', items)
+        bills = [bill for _, _, _, bill in chunk if bill]
+        conn.executemany('INSERT INTO bill (OrderID, amount, method, date, created_at) VALUES (?, ?, ?, ?, ?)', bills)
+        conn.commit()
+        counts['customer'] += len(chunk)
+        counts['orders'] += len(chunk)
+        counts['order_item'] += len(items)
+        counts['bill'] += len(bills)
+        log(f'  orders {counts["orders"]:>10,} / {order_total:,}')
+
+    # Reservations: one lunch or dinner sitting per (table, day) slot, so add tables until the slots fit
+    reservation_total = round(RESERVATIONS * scale)
+    booking_days = days + BOOKING_HORIZON_DAYS
+    tables = conn.execute(
+        'SELECT TableID, price, capacity, turn_minutes FROM restaurant_table ORDER BY TableID'
+    ).fetchall()
+    needed_tables = -(-reservation_total // int(booking_days * MAX_TABLE_OCCUPANCY))
+    if needed_tables > len(tables):
+        next_id = tables[-1][0] + 1
+        extra = []
+        for n in range(needed_tables - len(tables)):
+            category, price, capacity = EXTRA_TABLE_TYPES[n % len(EXTRA_TABLE_TYPES)]
+            extra.append(
+                (next_id + n, category, price, capacity, app_module.TURN_MINUTES[category], first_day.isoformat())
+            )
+        counts['restaurant_table'] = insert_chunked(
+            conn,
+            'INSERT INTO restaurant_table (TableID, category, price, capacity, turn_minutes, created_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            extra, chunk_size
+        )
+        tables += [(table_id, price, capacity, turn_minutes) for table_id, _, price, capacity, turn_minutes, _ in extra]
+
+    slots = sorted(rng.sample(range(len(tables) * booking_days), reservation_total))
+    first_customer_id = order_total + 1
+
+    def reservation_rows():
+        """(customer, payment, reservation) per booking; slots are day-major, so dates ascend"""
+        for n, slot in enumerate(slots):
+            day, table_index = divmod(slot, len(tables))
+            table_id, price, capacity, turn_minutes = tables[table_index]
+            reservation_date = first_day + timedelta(days=day)
+            start = datetime.combine(reservation_date, datetime.min.time()) + timedelta(
+                hours=weighted(rng, BOOKING_HOUR_WEIGHTS), minutes=rng.choice([0, 15, 30, 45])
+            )
+            end = start + timedelta(minutes=turn_minutes)
+            booked_at = datetime.combine(reservation_date, datetime.min.time()) - timedelta(
+                days=rng.randint(1, 30), seconds=rng.randrange(86400)
+            )
+            customer_id = first_customer_id + n
+            party_size = min(capacity, weighted(rng, PARTY_SIZE_WEIGHTS))
+            phone = f'555-{rng.randrange(10000):04d}'
+            yield (
+                (customer_id, f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}', phone, booked_at.strftime(TIMESTAMP)),
+                (n + 1, customer_id, price, weighted(rng, PAYMENT_METHOD_WEIGHTS), *[booked_at.strftime(TIMESTAMP)] * 2),
+                (customer_id, table_id, n + 1, weighted(rng, employee_weights), reservation_date.isoformat(),
+                 start.strftime(app_module.SLOT_FORMAT), end.strftime(app_module.SLOT_FORMAT), party_size, rng.choice(SPECIAL_REQUESTS), booked_at.strftime(TIMESTAMP)),
+            )
+
+    payment_offset = conn.execute('SELECT COALESCE(MAX(PaymentID), 0) FROM payment').fetchone()[0]
+    counts.update(payment=0, reservation=0)
+    rows = reservation_rows()
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        conn.execute('BEGIN')
+        conn.executemany('INSERT INTO customer (CustomerID, CustomerName, phone, created_at) VALUES (?, ?, ?, ?)',
+                         [customer for customer, _, _ in chunk])
+        conn.executemany(
+            'INSERT INTO payment (PaymentID, CustomerID, amount, payment_method, transaction_date, created_at) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            [(payment_offset + payment_id, *rest) for _, (payment_id, *rest), _ in chunk]
+        )
+        conn.executemany(
+            'INSERT INTO reservation (CustomerID, TableID, PaymentID, EmpID, reservation_date, start_time, end_time, '
+            'party_size, special_requests, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            [(customer_id, table_id, payment_offset + payment_id, *rest)
+             for _, _, (customer_id, table_id, payment_id, *rest) in chunk]
+        )
+        conn.commit()
+        counts['customer'] += len(chunk)
+        counts['payment'] += len(chunk)
+        counts['reservation'] += len(chunk)
+    log(f'  reservations {counts["reservation"]:>10,}')
+
+    # Reviews, spread over the year with the same daily pattern as orders
+    review_days = rng.choices(range(days), day_weights, k=round(REVIEWS * scale))
+    review_days.sort()
+
+    def review_rows():
+        for d in review_days:
+            rating = weighted(rng, RATING_WEIGHTS)
+            created_at = datetime.combine(first_day + timedelta(days=d), datetime.min.time()) + timedelta(
+                hours=rng.choice(hours), seconds=rng.randrange(3600)
+            )
+            yield (rating, rng.choice(FIRST_NAMES), REVIEW_TEXT[rating], created_at.strftime(TIMESTAMP))
+
+    counts['review'] = insert_chunked(
+        conn, 'INSERT INTO review (rating, name, description, created_at) VALUES (?, ?, ?, ?)',
+        review_rows(), chunk_size
+    )
+    log(f'  reviews {counts["review"]:>10,}')
+    conn.close()
+
+    # Recreate indexes and triggers, then bring the derived tables up to date
+    app_module.init_database()
+    conn = app_module.get_db_connection()
+    conn.execute('BEGIN IMMEDIATE')
+    app_module.rebuild_review_stats(conn)
+    conn.execute('UPDATE table_version SET version = version + 1')
+    conn.commit()
+    conn.execute('ANALYZE')
+    conn.close()
+    app_module.menu_cache.invalidate()
+
+    log(f'Generated in {time.perf_counter() - started:.1f} s: '
+        + ', '.join(f'{table} {count:,}' for table, count in counts.items()))
+    return counts
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--db', default=app_module.DATABASE, help='database file to fill (created if missing)')
+    parser.add_argument('--scale', type=float, default=1.0, help='1.0 = 1M orders, 200k reservations, 100k reviews')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--end', type=date.fromisoformat, default=DEFAULT_END, help='last day of order history')
+    parser.add_argument('--days', type=int, default=365, help='days of order history')
+    parser.add_argument('--chunk-size', type=int, default=50_000, help='rows per transaction')
+    args = parser.parse_args()
+
+    app_module.db_pool = app_module.ConnectionPool(os.path.abspath(args.db))
+    app_module.init_database()
+    generate(args.scale, args.seed, args.end, args.days, args.chunk_size)
+    app_module.db_pool.close_all()
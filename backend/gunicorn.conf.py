@@ -0,0 +1,46 @@
+"""
+Gunicorn configuration for the Restaurant Management System API
+
+Workers default to 2 x CPU cores + 1, each running several threads; override
+with WEB_CONCURRENCY and GUNICORN_THREADS. Graceful reload (new code, no
+dropped requests): kill -HUP <master pid>
+"""
+import multiprocessing
+import os
+import subprocess
+import sys
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Workers finish in-flight requests for up to graceful_timeout on reload/stop
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then to bound memory growth
+max_requests = 10000
+max_requests_jitter = 1000
+
+accesslog = '-'
+errorlog = '-'
+
+
+def _init_database():
+    """
+    Create/upgrade the schema once, before workers fork. It runs in a child
+    process so the master never imports app: workers forked after a reload
+    then import the current code (and its schema changes) instead of
+    inheriting the master's copy.
+    """
+    subprocess.run([sys.executable, '-c', 'import app; app.init_database()'], check=True)
+
+
+def on_starting(server):
+    _init_database()
+
+
+def on_reload(server):
+    _init_database()
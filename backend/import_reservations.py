@@ -0,0 +1,64 @@
+"""
+Bulk import of reservations from a CSV file.
+
+Group and event bookings usually arrive as spreadsheets. This loads one
+exported as CSV, with the POST /api/reservations field names as the header
+(tableId, customerName, reservationDate and partySize required; phone,
+startTime, endTime, specialRequests, empId, paymentMethod and paymentAmount
+optional). Every row gets the same capacity and overlap checks as a booking
+made through the API. Valid rows are imported, invalid ones are listed in the
+error report. The file is streamed, so memory use does not grow with its size.
+
+Usage:
+    python import_reservations.py bookings.csv
+    python import_reservations.py bookings.csv --db restaurant.db --emp-id 3 --errors rejected.csv
+    python import_reservations.py - < bookings.csv
+"""
+import argparse
+import csv
+import os
+import sys
+
+import app as app_module
+
+
+def import_file(lines, emp_id, chunk_size, errors):
+    """Import CSV lines; rejected rows are written to errors (a csv writer). Returns the import."""
+    conn = app_module.get_db_connection()
+    try:
+        return app_module.ReservationImport(
+            conn, emp_id, chunk_size, on_error=lambda line, error: errors.writerow([line, error])
+        ).run(lines)
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('csv', help="CSV file to import, or - for standard input")
+    parser.add_argument('--db', default=app_module.DATABASE, help='database file to import into')
+    parser.add_argument('--emp-id', type=int, default=1, help='employee recorded on rows without an empId')
+    parser.add_argument('--chunk-size', type=int, default=app_module.IMPORT_CHUNK_SIZE, help='rows per transaction')
+    parser.add_argument('--errors', help='write rejected rows (line, error) to this CSV file instead of stderr')
+    args = parser.parse_args()
+
+    app_module.db_pool = app_module.ConnectionPool(os.path.abspath(args.db))
+    app_module.init_database()
+
+    source = sys.stdin if args.csv == '-' else open(args.csv, newline='', encoding='utf-8-sig')
+    report = open(args.errors, 'w', newline='') if args.errors else sys.stderr
+    errors = csv.writer(report)
+    errors.writerow(['line', 'error'])
+    try:
+        result = import_file(source, args.emp_id, args.chunk_size, errors)
+    except app_module.InvalidReservation as e:
+        sys.exit(f'✗ {e}')
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if report is not sys.stderr:
+            report.close()
+        app_module.db_pool.close_all()
+
+    print(f'✓ Imported {result.imported} reservations, rejected {result.failed} rows')
+    sys.exit(1 if result.failed else 0)
@@ -0,0 +1,40 @@
+"""
+Rebuild the review statistics counters used by GET /api/stats
+Recomputes review_rating_count and review_daily_count from the review table
+and reports any drift between the stored and recomputed counts.
+Run this to verify the counters, or to repair them after editing reviews by hand
+"""
+import sys
+
+import app as app_module
+
+
+def rebuild():
+    # Creates the statistics tables and triggers if this database predates them
+    app_module.init_database()
+    conn = app_module.get_db_connection()
+
+    try:
+        print("Rebuilding review statistics...")
+        conn.execute('BEGIN IMMEDIATE')
+        drift = app_module.rebuild_review_stats(conn)
+        conn.commit()
+
+        if not drift:
+            print("✓ No drift: stored counters matched the review table")
+        else:
+            print(f"⚠ Drift found in {len(drift)} counter(s), now corrected:")
+            for key, (stored, actual) in drift.items():
+                print(f"  {key}: stored {stored}, actual {actual}")
+        return drift
+
+    except Exception as e:
+        print(f"✗ Rebuild failed: {e}")
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    sys.exit(1 if rebuild() else 0)
@@ -0,0 +1,1600 @@
+"""
+In-process tests for the Flask API.
+
+Each test runs against a fresh temporary database through the Flask test
+client, so no server on localhost:5000 is needed (unlike test_transactions.py).
+"""
+
+import asyncio
+import csv
+import gzip
+import io
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+from flask.json.provider import DefaultJSONProvider
+
+import app as app_module
+
+
+def count_queries(monkeypatch):
+    """Record every SELECT run on connections handed out by get_db_connection()"""
+    statements = []
+    original = app_module.get_db_connection
+
+    def traced():
+        conn = original()
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(app_module, 'get_db_connection', traced)
+    return statements
+
+
+def create_orders(client, emp_id, count):
+    for i in range(count):
+        response = client.post('/api/orders', json={
+            'customerName': f'Customer {i}',
+            'empId': emp_id,
+            'items': [
+                {'itemId': 1 + i % 12, 'quantity': 1 + i % 3},
+                {'itemId': 1 + (i + 5) % 12, 'quantity': 2}
+            ]
+        })
+        assert response.status_code == 201
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    """Connection pool pointed at a freshly initialized temporary database"""
+    pool = app_module.ConnectionPool(str(tmp_path / 'restaurant.db'), max_size=2, timeout=0.2)
+    monkeypatch.setattr(app_module, 'db_pool', pool)
+    monkeypatch.setattr(app_module, 'menu_cache', app_module.MenuCache())
+    app_module.init_database()
+    yield pool
+    pool.close_all()
+
+
+@pytest.fixture
+def client(pool):
+    app_module.app.config['TESTING'] = True
+    with app_module.app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def emp_id(client):
+    response = client.post('/api/auth/signup', json={
+        'email': 'cashier@restaurant.com',
+        'password': 'password123',
+        'role': 'cashier'
+    })
+    return response.get_json()['employee']['id']
+
+
+# ==================== CONNECTION POOL ====================
+
+def test_pool_reuses_connections(client, pool):
+    for _ in range(5):
+        assert client.get('/api/menu').status_code == 200
+
+    stats = client.get('/api/health').get_json()['pool']
+    assert stats['size'] == 1
+    assert stats['inUse'] == 0
+    assert stats['acquired'] >= 6
+
+
+def test_pool_releases_connection_on_error(client, pool, monkeypatch):
+    def broken_stats():
+        # Fails before reaching conn.close(), like a handler hitting an exception
+        try:
+            conn = app_module.get_db_connection()
+            conn.execute('SELECT * FROM missing_table')
+        except Exception as e:
+            return {'success': False, 'error': str(e)}, 500
+
+    monkeypatch.setitem(app_module.app.view_functions, 'get_stats', broken_stats)
+    for _ in range(3):
+        assert client.get('/api/stats').status_code == 500
+
+    assert pool.stats()['inUse'] == 0
+
+
+def test_pool_rolls_back_open_transaction_on_release(pool):
+    conn = pool.acquire()
+    conn.execute('BEGIN TRANSACTION')
+    conn.execute("INSERT INTO review (name, rating, description) VALUES ('x', 5, 'y')")
+    conn.close()
+
+    conn = pool.acquire()
+    assert conn.execute('SELECT COUNT(*) FROM review').fetchone()[0] == 0
+    conn.close()
+
+
+def test_teardown_does_not_release_a_connection_taken_by_another_request(pool):
+    with app_module.app.app_context():
+        conn = app_module.get_db_connection()
+        conn.close()  # the view returns it, but it stays tracked on g
+
+        taken = []
+        thread = threading.Thread(target=lambda: taken.append(pool.acquire()))
+        thread.start()
+        thread.join()
+        other = taken[0]
+        assert other is conn
+        other.execute('BEGIN TRANSACTION')
+    # Teardown ran: the other request's connection and transaction are untouched
+
+    assert other.in_transaction
+    assert pool.stats()['inUse'] == 1
+    third = pool.acquire()
+    assert third is not other
+    third.close()
+    other.close()
+    assert pool.stats()['inUse'] == 0
+
+
+def test_pool_times_out_when_exhausted(pool):
+    held = [pool.acquire(), pool.acquire()]
+    with pytest.raises(app_module.PoolTimeoutError):
+        pool.acquire()
+    for conn in held:
+        conn.close()
+
+    stats = pool.stats()
+    assert stats['inUse'] == 0
+    assert stats['size'] == 2
+
+
+def test_pool_stats_count_waiting_threads_separately(tmp_path):
+    pool = app_module.ConnectionPool(str(tmp_path / 'waiting.db'), max_size=1, timeout=5)
+    held = pool.acquire()
+    taken = []
+    thread = threading.Thread(target=lambda: taken.append(pool.acquire()))
+    thread.start()
+    while pool.stats()['waiting'] == 0:
+        time.sleep(0.01)
+
+    stats = pool.stats()
+    assert (stats['size'], stats['inUse'], stats['idle'], stats['waiting']) == (1, 1, 0, 1)
+
+    held.close()
+    thread.join()
+    stats = pool.stats()
+    assert (stats['inUse'], stats['idle'], stats['waiting'], stats['waits']) == (1, 0, 0, 1)
+    taken[0].close()
+    pool.close_all()
+
+
+# ==================== GUNICORN ====================
+
+def test_gunicorn_master_initializes_database_without_importing_app(tmp_path):
+    backend = os.path.dirname(os.path.abspath(__file__))
+    script = (
+        "import runpy, sys\n"
+        f"config = runpy.run_path({os.path.join(backend, 'gunicorn.conf.py')!r})\n"
+        "config['on_starting'](None)\n"
+        "config['on_reload'](None)\n"
+        "print('app' in sys.modules)\n"
+    )
+    env = dict(os.environ, PYTHONPATH=backend)
+    result = subprocess.run([sys.executable, '-c', script], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
+
+    conn = sqlite3.connect(tmp_path / 'restaurant.db')
+    assert conn.execute('SELECT COUNT(*) FROM restaurant_table').fetchone()[0] == 12
+    conn.close()
+
+
+# ==================== ORDERS ====================
+
+def test_get_orders_query_count_is_constant(client, emp_id, monkeypatch):
+    create_orders(client, emp_id, 3)
+    statements = count_queries(monkeypatch)
+    client.get('/api/orders')
+    small = len([s for s in statements if s.lstrip().startswith('SELECT')])
+
+    create_orders(client, emp_id, 30)
+    statements.clear()
+    client.get('/api/orders')
+    large = len([s for s in statements if s.lstrip().startswith('SELECT')])
+
+    assert small == large == 2
+
+
+def test_get_orders_matches_single_order_lookup(client, emp_id):
+    create_orders(client, emp_id, 5)
+    orders = client.get('/api/orders').get_json()['orders']
+
+    assert len(orders) == 5
+    for order in orders:
+        single = client.get(f"/api/orders/{order['orderId']}").get_json()['order']
+        assert order == single
+
+
+# ==================== BILLS ====================
+
+def test_get_bills_assembles_items_per_bill(client, emp_id, monkeypatch):
+    create_orders(client, emp_id, 4)
+    for order_id in (1, 3, 4):
+        assert client.post('/api/bills', json={'orderId': order_id, 'paymentMethod': 'cash'}).status_code == 201
+
+    statements = count_queries(monkeypatch)
+    bills = client.get('/api/bills').get_json()['bills']
+    assert len([s for s in statements if s.lstrip().startswith('SELECT')]) == 1
+
+    assert [bill['orderId'] for bill in bills] == [4, 3, 1]
+    for bill in bills:
+        single = client.get(f"/api/bills/{bill['billId']}").get_json()['bill']
+        for item in single['items']:
+            del item['total']
+        assert bill == single
+
+
+# ==================== PAGINATION ====================
+
+def collect_pages(client, path, key, limit):
+    """Walk a list endpoint page by page, returning the items and page count"""
+    items, pages, cursor = [], 0, None
+    while True:
+        url = f'{path}?limit={limit}' + (f'&after={cursor}' if cursor else '')
+        body = client.get(url).get_json()
+        assert body['success']
+        items.extend(body[key])
+        pages += 1
+        cursor = body['nextCursor']
+        if cursor is None:
+            return items, pages
+
+
+@pytest.mark.parametrize('path,key', [
+    ('/api/orders', 'orders'),
+    ('/api/bills', 'bills'),
+    ('/api/customers', 'customers'),
+])
+def test_keyset_pages_cover_full_list(client, emp_id, path, key):
+    create_orders(client, emp_id, 7)
+    for order_id in range(1, 8):
+        client.post('/api/bills', json={'orderId': order_id, 'paymentMethod': 'cash'})
+
+    full = client.get(path).get_json()
+    assert 'nextCursor' not in full
+
+    items, pages = collect_pages(client, path, key, limit=3)
+    assert items == full[key]
+    assert pages == 3
+
+
+def test_review_pages_break_created_at_ties(client):
+    # Reviews inserted in the same second share created_at; ReviewID orders them
+    for i in range(5):
+        client.post('/api/reviews', json={'name': f'Guest {i}', 'rating': 1 + i, 'comment': 'Nice'})
+
+    items, pages = collect_pages(client, '/api/reviews', 'reviews', limit=2)
+    assert [review['id'] for review in items] == [5, 4, 3, 2, 1]
+    assert pages == 3
+
+
+@pytest.mark.parametrize('query', ['limit=0', 'limit=abc', 'limit=5000', 'limit=2&after=garbage'])
+def test_invalid_page_args_are_rejected(client, query):
+    response = client.get(f'/api/orders?{query}')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+# ==================== INDEXES ====================
+
+def test_hot_queries_use_indexes(pool):
+    conn = pool.acquire()
+    assert app_module.check_hot_query_plans(conn) == []
+    conn.close()
+
+
+def test_missing_index_is_reported(pool):
+    # A fresh connection, so no cached plan from init_database() is reused
+    conn = sqlite3.connect(pool.database)
+    conn.row_factory = sqlite3.Row
+    conn.execute('DROP INDEX idx_bill_order')
+    assert app_module.check_hot_query_plans(conn) == ['bill by order']
+    conn.close()
+
+
+# ==================== SQLITE PROFILE ====================
+
+def test_health_reports_active_sqlite_profile(client):
+    database = client.get('/api/health').get_json()['database']
+    assert database['profile'] == 'balanced'
+    assert database['settings']['journal_mode'] == 'wal'
+    assert database['settings']['busy_timeout'] == 5000
+    assert database['settings']['synchronous'] == 1  # NORMAL
+
+
+def test_unknown_sqlite_profile_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        app_module.ConnectionPool(str(tmp_path / 'restaurant.db'), profile='fast')
+
+
+# ==================== MENU CACHE ====================
+
+def test_menu_is_served_from_snapshot(client, emp_id, monkeypatch):
+    client.get('/api/menu')
+    statements = count_queries(monkeypatch)
+    client.get('/api/menu')
+    client.get('/api/menu/categories')
+    client.post('/api/orders', json={
+        'customerName': 'Walk-in',
+        'empId': emp_id,
+        'items': [{'itemId': i, 'quantity': 1} for i in range(1, 9)]
+    })
+
+    assert not [s for s in statements if 'FROM menu' in s]
+
+
+def test_menu_writes_invalidate_snapshot(client):
+    client.get('/api/menu')
+    client.put('/api/menu/1', json={
+        'name': 'Double Burger', 'price': 11.5, 'category': 'Main Course', 'description': 'Two patties'
+    })
+    names = [item['name'] for item in client.get('/api/menu').get_json()['menu']]
+    assert 'Double Burger' in names and 'Classic Burger' not in names
+
+    client.post('/api/menu', json={'name': 'Tea', 'price': 1.5, 'category': 'Hot Drinks', 'description': 'Black tea'})
+    assert 'Hot Drinks' in client.get('/api/menu/categories').get_json()['categories']
+
+
+def test_menu_change_from_another_process_is_detected(client, pool):
+    client.get('/api/menu')
+
+    # A write through a separate connection, as another worker process would make
+    other = sqlite3.connect(pool.database)
+    other.execute('UPDATE menu SET price = 99 WHERE ItemID = 1')
+    other.commit()
+    other.close()
+
+    menu = client.get('/api/menu').get_json()['menu']
+    assert [item['price'] for item in menu if item['id'] == 1] == [99.0]
+
+
+# ==================== ORDER CREATION ====================
+
+def test_create_order_merges_repeated_items(client, emp_id):
+    response = client.post('/api/orders', json={
+        'customerName': 'Catering',
+        'empId': emp_id,
+        'items': [
+            {'itemId': 1, 'quantity': 2},
+            {'itemId': 4, 'quantity': 1},
+            {'itemId': 1, 'quantity': 3}
+        ]
+    })
+    assert response.status_code == 201
+    order = response.get_json()['order']
+    assert [(item['itemId'], item['quantity']) for item in order['items']] == [(1, 5), (4, 1)]
+
+    stored = client.get(f"/api/orders/{order['orderId']}").get_json()['order']
+    assert stored['items'] == order['items']
+    assert stored['totalAmount'] == order['totalAmount']
+
+
+def test_create_order_reads_before_first_write(client, emp_id, monkeypatch):
+    statements = count_queries(monkeypatch)
+    client.post('/api/orders', json={
+        'customerName': 'Catering',
+        'empId': emp_id,
+        'items': [{'itemId': i, 'quantity': 1} for i in range(1, 13)]
+    })
+    kinds = [s.split()[0] for s in statements if s.split()[0] in ('SELECT', 'INSERT')]
+    first_write = kinds.index('INSERT')
+    assert 'SELECT' not in kinds[first_write:]
+    assert kinds.count('INSERT') == 2 + 12
+
+
+def test_create_order_with_unknown_item_writes_nothing(client, emp_id):
+    response = client.post('/api/orders', json={
+        'customerName': 'Walk-in',
+        'empId': emp_id,
+        'items': [{'itemId': 1, 'quantity': 1}, {'itemId': 999, 'quantity': 1}]
+    })
+    assert response.status_code == 404
+    assert client.get('/api/orders').get_json()['orders'] == []
+    assert client.get('/api/customers').get_json()['customers'] == []
+
+
+# ==================== BATCH ORDERS ====================
+
+def order_body(emp_id, i, **overrides):
+    body = {
+        'customerName': f'Queued {i}',
+        'empId': emp_id,
+        'items': [{'itemId': 1 + i % 12, 'quantity': 1}, {'itemId': 1 + (i + 3) % 12, 'quantity': 2}],
+    }
+    body.update(overrides)
+    return body
+
+
+def test_batch_creates_orders_like_create_order(client, emp_id):
+    orders = [order_body(emp_id, i) for i in range(3)]
+    response = client.post('/api/orders/batch', json={'orders': orders})
+    assert response.status_code == 201
+    body = response.get_json()
+    assert (body['success'], body['created'], body['failed']) == (True, 3, 0)
+    assert [result['index'] for result in body['results']] == [0, 1, 2]
+
+    single = client.post('/api/orders', json=order_body(emp_id, 0)).get_json()['order']
+    batched = body['results'][0]['order']
+    assert {key: value for key, value in batched.items() if key not in ('orderId', 'customerId', 'date')} == \
+        {key: value for key, value in single.items() if key not in ('orderId', 'customerId', 'date')}
+
+    # The created orders read back like any other, and ids keep counting up
+    for result in body['results']:
+        order = result['order']
+        stored = client.get(f"/api/orders/{order['orderId']}").get_json()['order']
+        assert stored['customerName'] == order['customerName']
+        assert stored['totalAmount'] == order['totalAmount']
+        assert stored['customerId'] == order['customerId']
+    assert single['orderId'] == body['results'][-1]['order']['orderId'] + 1
+
+
+def test_batch_reports_invalid_orders_with_create_order_errors(client, emp_id):
+    invalid = [
+        order_body(emp_id, 1, customerName=''),
+        order_body(999, 2),
+        order_body(emp_id, 3, items=[{'itemId': 99, 'quantity': 1}]),
+        order_body(emp_id, 4, items=[{'itemId': 1, 'quantity': 0}]),
+    ]
+    expected = [client.post('/api/orders', json=order) for order in invalid]
+
+    response = client.post('/api/orders/batch', json={'orders': [order_body(emp_id, 0), *invalid]})
+    assert response.status_code == 207
+    body = response.get_json()
+    assert (body['success'], body['created'], body['failed']) == (False, 1, 4)
+    assert body['results'][0]['success']
+    for result, single in zip(body['results'][1:], expected):
+        assert result['status'] == single.status_code
+        assert result['error'] == single.get_json()['error']
+    assert len(client.get('/api/orders').get_json()['orders']) == 1
+
+
+def test_batch_malformed_order_fails_only_its_own_result(client, emp_id):
+    orders = [
+        order_body(emp_id, 0),
+        order_body(emp_id, 1, items=[{'itemId': 1, 'quantity': '2'}]),
+        order_body(emp_id, 2, items=['not an item']),
+        order_body([emp_id], 3),
+        order_body(emp_id, 4),
+    ]
+    response = client.post('/api/orders/batch', json={'orders': orders})
+    assert response.status_code == 207
+    results = response.get_json()['results']
+    assert [result['success'] for result in results] == [True, False, False, False, True]
+    assert results[1] == {'index': 1, 'success': False, 'status': 400, 'error': 'Quantity must be a number'}
+    assert results[2]['status'] == 400
+    assert results[3]['status'] == 500
+    names = {order['customerName'] for order in client.get('/api/orders').get_json()['orders']}
+    assert names == {'Queued 0', 'Queued 4'}
+
+
+@pytest.mark.parametrize('items', [
+    [{'itemId': 1, 'quantity': '2'}],
+    [{'itemId': 1, 'quantity': True}],
+    ['not an item'],
+])
+def test_create_order_rejects_malformed_items(client, emp_id, items):
+    response = client.post('/api/orders', json=order_body(emp_id, 0, items=items))
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_batch_commits_one_transaction_per_chunk(client, emp_id, monkeypatch):
+    statements = count_queries(monkeypatch)
+    response = client.post('/api/orders/batch', json={
+        'orders': [order_body(emp_id, i) for i in range(5)], 'chunkSize': 2
+    })
+    assert response.status_code == 201
+    assert statements.count('BEGIN IMMEDIATE') == 3
+    assert statements.count('COMMIT') == 3
+
+
+def test_batch_failed_chunk_rolls_back_only_that_chunk(client, emp_id, pool):
+    conn = pool.acquire()
+    conn.execute('''
+        CREATE TRIGGER fail_order BEFORE INSERT ON orders WHEN NEW.customer_name = 'boom'
+        BEGIN SELECT RAISE(ABORT, 'order rejected'); END
+    ''')
+    conn.commit()
+    conn.close()
+
+    orders = [order_body(emp_id, 0), order_body(emp_id, 1), order_body(emp_id, 2, customerName='boom'),
+              order_body(emp_id, 3)]
+    body = client.post('/api/orders/batch', json={'orders': orders, 'chunkSize': 2}).get_json()
+    assert [result['success'] for result in body['results']] == [True, True, False, False]
+    assert body['results'][3]['error'] == 'order rejected'
+    names = {order['customerName'] for order in client.get('/api/orders').get_json()['orders']}
+    assert names == {'Queued 0', 'Queued 1'}
+
+
+def test_batch_validates_each_chunk_in_its_write_transaction(client, emp_id, monkeypatch):
+    other = client.post('/api/auth/signup', json={
+        'email': 'leaving@restaurant.com', 'password': 'password123', 'role': 'cashier'
+    }).get_json()['employee']['id']
+
+    # The employee leaves after the first chunk is written, before the second is validated
+    get_menu = app_module.menu_cache.get
+    calls = []
+
+    def get_menu_then_remove_employee(conn):
+        calls.append(conn)
+        if len(calls) == 2:
+            conn.execute('DELETE FROM employee WHERE EmpID = ?', (other,))
+        return get_menu(conn)
+
+    monkeypatch.setattr(app_module.menu_cache, 'get', get_menu_then_remove_employee)
+    orders = [order_body(other, 0), order_body(other, 1)]
+    body = client.post('/api/orders/batch', json={'orders': orders, 'chunkSize': 1}).get_json()
+    assert body['results'][0]['success'] is True
+    assert body['results'][1] == {'index': 1, 'success': False, 'status': 404, 'error': 'Employee not found'}
+
+
+def test_batch_order_ids_do_not_depend_on_sqlite_sequence(client, emp_id, pool):
+    client.post('/api/orders', json=order_body(emp_id, 0))
+    conn = pool.acquire()
+    conn.execute("DELETE FROM sqlite_sequence WHERE name IN ('orders', 'customer')")
+    conn.commit()
+    conn.close()
+
+    body = client.post('/api/orders/batch', json={'orders': [order_body(emp_id, i) for i in range(3)]}).get_json()
+    assert body['success'] is True
+    ids = [result['order']['orderId'] for result in body['results']]
+    assert len(set(ids)) == 3
+    for order_id in ids:
+        assert client.get(f'/api/orders/{order_id}').status_code == 200
+
+
+@pytest.mark.parametrize('payload', [
+    {},
+    {'orders': []},
+    {'orders': 'nope'},
+    {'orders': [{}], 'chunkSize': 0},
+    {'orders': [{}], 'chunkSize': '2'},
+    [{'orders': [{}]}],
+])
+def test_batch_rejects_malformed_request(client, payload):
+    response = client.post('/api/orders/batch', json=payload)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+# ==================== REVIEW STATISTICS ====================
+
+def expected_stats(pool):
+    """/api/stats computed the old way, with aggregates over the review table"""
+    conn = sqlite3.connect(pool.database)
+    total = conn.execute('SELECT COUNT(*) FROM review').fetchone()[0]
+    avg = conn.execute('SELECT AVG(rating) FROM review').fetchone()[0]
+    dist = conn.execute('SELECT rating, COUNT(*) FROM review GROUP BY rating').fetchall()
+    recent = conn.execute(
+        "SELECT COUNT(*) FROM review WHERE created_at >= datetime('now', '-7 days')"
+    ).fetchone()[0]
+    conn.close()
+    return {
+        'total_reviews': total,
+        'average_rating': round(avg, 1) if avg else 0,
+        'recent_reviews_7days': recent,
+        'rating_distribution': {f'{rating}_star': count for rating, count in dist}
+    }
+
+
+def test_stats_counters_follow_creates_and_deletes(client, pool):
+    assert client.get('/api/stats').get_json()['stats'] == expected_stats(pool)
+
+    for rating in (5, 4, 4, 2, 5, 5):
+        client.post('/api/reviews', json={'name': 'Guest', 'rating': rating, 'comment': 'ok'})
+    client.delete('/api/reviews/2')
+
+    # Backdated reviews, on both sides of the 7-day cutoff
+    conn = sqlite3.connect(pool.database)
+    conn.execute("INSERT INTO review (rating, name, description, created_at) VALUES (1, 'Old', 'x', datetime('now', '-30 days'))")
+    conn.execute("INSERT INTO review (rating, name, description, created_at) VALUES (3, 'Edge', 'x', datetime('now', '-7 days', '+1 minute'))")
+    conn.execute("INSERT INTO review (rating, name, description, created_at) VALUES (3, 'Edge', 'x', datetime('now', '-7 days', '-1 minute'))")
+    conn.commit()
+    conn.close()
+
+    stats = client.get('/api/stats').get_json()['stats']
+    assert stats == expected_stats(pool)
+    assert stats['total_reviews'] == 8
+    assert stats['recent_reviews_7days'] == 6
+
+
+def test_rebuild_review_stats_reports_and_fixes_drift(client, pool):
+    for rating in (5, 3):
+        client.post('/api/reviews', json={'name': 'Guest', 'rating': rating, 'comment': 'ok'})
+
+    conn = pool.acquire()
+    assert app_module.rebuild_review_stats(conn) == {}
+    conn.execute('UPDATE review_rating_count SET count = 7 WHERE rating = 5')
+    drift = app_module.rebuild_review_stats(conn)
+    conn.commit()
+    conn.close()
+
+    assert drift == {'5_star': (7, 1)}
+    assert client.get('/api/stats').get_json()['stats'] == expected_stats(pool)
+
+
+# ==================== TABLE AVAILABILITY ====================
+
+def reserve(client, emp_id, table_id, reservation_date, party_size=2):
+    response = client.post('/api/reservations', json={
+        'tableId': table_id, 'customerName': f'Guest {table_id}', 'reservationDate': reservation_date,
+        'partySize': party_size, 'paymentMethod': 'cash', 'paymentAmount': 20, 'empId': emp_id,
+    })
+    assert response.status_code == 201
+    return response.get_json()['reservation']['reservationId']
+
+
+def test_available_tables_ranked_by_best_fit(client):
+    response = client.get('/api/tables/available?date=2030-01-01&partySize=5')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body['date'], body['partySize']) == ('2030-01-01', 5)
+    # Default tables: 1-4 seat 4 ($2), 5-8 seat 6 ($5), 9-10 seat 8 ($10), 11-12 seat 10 ($7)
+    assert [table['id'] for table in body['tables']] == [5, 6, 7, 8, 9, 10, 11, 12]
+    assert body['tables'][0] == {'id': 5, 'category': 'Premium', 'price': 5.0, 'capacity': 6, 'spareSeats': 1}
+
+
+def test_available_tables_exclude_only_that_dates_reservations(client, emp_id):
+    reserve(client, emp_id, 1, '2030-01-01')
+    reserve(client, emp_id, 2, '2030-01-02')
+
+    on_first = client.get('/api/tables/available?date=2030-01-01&partySize=2').get_json()['tables']
+    assert [table['id'] for table in on_first][:3] == [2, 3, 4]
+    on_second = client.get('/api/tables/available?date=2030-01-02&partySize=2').get_json()['tables']
+    assert [table['id'] for table in on_second][:3] == [1, 3, 4]
+
+
+def test_available_tables_etag_changes_with_reservations(client, emp_id):
+    path = '/api/tables/available?date=2030-01-01&partySize=2'
+    etag = client.get(path).headers['ETag']
+    assert client.get(path, headers={'If-None-Match': etag}).status_code == 304
+
+    reserve(client, emp_id, 1, '2030-01-01')
+    response = client.get(path, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert 1 not in [table['id'] for table in response.get_json()['tables']]
+
+
+@pytest.mark.parametrize('query', [
+    '', 'date=2030-01-01', 'partySize=2', 'date=01/01/2030&partySize=2',
+    'date=2030-01-01&partySize=0', 'date=2030-01-01&partySize=two',
+])
+def test_available_tables_rejects_bad_args(client, query):
+    response = client.get(f'/api/tables/available?{query}')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+# ==================== TIME SLOTS ====================
+
+def book_slot(client, emp_id, table_id, start_time=None, end_time=None, reservation_date='2030-01-01'):
+    body = {
+        'tableId': table_id, 'customerName': f'Guest {table_id}', 'reservationDate': reservation_date,
+        'partySize': 2, 'paymentMethod': 'cash', 'paymentAmount': 20, 'empId': emp_id,
+    }
+    if start_time:
+        body['startTime'] = start_time
+    if end_time:
+        body['endTime'] = end_time
+    return client.post('/api/reservations', json=body)
+
+
+def test_slot_defaults_to_table_turn_time(client, emp_id):
+    # Table 9 is VIP: 150 minute turns
+    reservation = book_slot(client, emp_id, 9, '19:00').get_json()['reservation']
+    assert (reservation['startTime'], reservation['endTime']) == ('2030-01-01 19:00', '2030-01-01 21:30')
+    assert reservation['reservationDate'] == '2030-01-01'
+
+    whole_day = book_slot(client, emp_id, 1).get_json()['reservation']
+    assert (whole_day['startTime'], whole_day['endTime']) == ('2030-01-01 00:00', '2030-01-02 00:00')
+
+
+@pytest.mark.parametrize('start_time, end_time, status', [
+    ('18:00', '19:00', 201),   # ends as the booking starts
+    ('21:00', '22:00', 201),   # starts as the booking ends
+    ('18:30', '19:30', 409),
+    ('20:30', '21:30', 409),
+    ('19:15', '20:45', 409),   # inside
+    ('18:00', '22:00', 409),   # around
+    (None, None, 409),         # whole day
+])
+def test_overlapping_slots_are_rejected(client, emp_id, start_time, end_time, status):
+    assert book_slot(client, emp_id, 3, '19:00', '21:00').status_code == 201
+    response = book_slot(client, emp_id, 3, start_time, end_time)
+    assert response.status_code == status
+    # Other tables and other days are unaffected
+    assert book_slot(client, emp_id, 4, '19:00', '21:00').status_code == 201
+    assert book_slot(client, emp_id, 3, '19:00', '21:00', reservation_date='2030-01-02').status_code == 201
+
+
+def test_slot_past_midnight_blocks_next_morning(client, emp_id):
+    reservation = book_slot(client, emp_id, 2, '23:00', '01:00').get_json()['reservation']
+    assert reservation['endTime'] == '2030-01-02 01:00'
+    assert book_slot(client, emp_id, 2, '00:30', reservation_date='2030-01-02').status_code == 409
+    assert book_slot(client, emp_id, 2, '01:00', reservation_date='2030-01-02').status_code == 201
+
+
+@pytest.mark.parametrize('fields', [
+    {'reservationDate': 'next friday'},
+    {'startTime': '7pm'},
+    {'startTime': '19:00', 'endTime': '25:00'},
+    {'endTime': '21:00'},
+])
+def test_bad_slots_are_rejected(client, emp_id, fields):
+    body = {
+        'tableId': 1, 'customerName': 'Guest', 'reservationDate': '2030-01-01', 'partySize': 2,
+        'paymentMethod': 'cash', 'paymentAmount': 20, 'empId': emp_id, **fields,
+    }
+    response = client.post('/api/reservations', json=body)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_overlap_check_uses_start_time_index(pool):
+    conn = pool.acquire()
+    sql, params = app_module.HOT_QUERIES['reservation conflict']
+    plan = ' '.join(row['detail'] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params))
+    conn.close()
+    assert 'idx_reservation_table_start (TableID=? AND start_time>? AND start_time<?)' in plan
+
+
+def test_legacy_database_is_upgraded_to_whole_day_slots(tmp_path, monkeypatch):
+    database = str(tmp_path / 'legacy.db')
+    conn = sqlite3.connect(database)
+    conn.executescript("""
+        CREATE TABLE restaurant_table (
+            TableID INTEGER PRIMARY KEY AUTOINCREMENT, category TEXT NOT NULL DEFAULT 'Standard',
+            price DECIMAL(10, 2) NOT NULL DEFAULT 2.00, capacity INTEGER NOT NULL DEFAULT 4,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        CREATE TABLE reservation (
+            ReservationID INTEGER PRIMARY KEY AUTOINCREMENT, CustomerID INTEGER NOT NULL,
+            TableID INTEGER NOT NULL, PaymentID INTEGER, EmpID INTEGER, reservation_date TEXT NOT NULL,
+            party_size INTEGER NOT NULL DEFAULT 2, special_requests TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        INSERT INTO restaurant_table (TableID, category, capacity) VALUES (1, 'Standard', 4), (2, 'VIP', 8);
+        INSERT INTO reservation (CustomerID, TableID, reservation_date) VALUES (1, 2, '2025-03-04');
+    """)
+    conn.close()
+
+    legacy = app_module.ConnectionPool(database)
+    monkeypatch.setattr(app_module, 'db_pool', legacy)
+    app_module.init_database()
+    app_module.init_database()  # idempotent
+    conn = sqlite3.connect(database)
+    assert conn.execute('SELECT TableID, turn_minutes FROM restaurant_table').fetchall() == [(1, 90), (2, 150)]
+    assert conn.execute('SELECT start_time, end_time FROM reservation').fetchall() == [
+        ('2025-03-04 00:00', '2025-03-05 00:00')
+    ]
+    conn.close()
+    legacy.close_all()
+
+
+def test_table_grid_lists_each_tables_slots(client, emp_id):
+    book_slot(client, emp_id, 1, '19:00', '21:00')
+    book_slot(client, emp_id, 1, '12:00')
+    book_slot(client, emp_id, 2, '23:00', '01:00', reservation_date='2029-12-31')  # runs into the day
+    book_slot(client, emp_id, 3, '12:00', reservation_date='2030-01-02')
+
+    response = client.get('/api/tables/grid?date=2030-01-01')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['date'] == '2030-01-01'
+    tables = {table['id']: table for table in body['tables']}
+    assert len(tables) == 12
+    assert [(slot['startTime'], slot['endTime']) for slot in tables[1]['slots']] == [
+        ('2030-01-01 12:00', '2030-01-01 13:30'), ('2030-01-01 19:00', '2030-01-01 21:00')
+    ]
+    assert tables[1]['slots'][0]['customerName'] == 'Guest 1'
+    assert tables[2]['slots'][0]['startTime'] == '2029-12-31 23:00'
+    assert tables[3]['slots'] == []
+    assert tables[9]['turnMinutes'] == 150
+
+    assert client.get('/api/tables/grid?date=tomorrow').status_code == 400
+
+
+def test_available_tables_exclude_booking_crossing_midnight(client, emp_id):
+    book_slot(client, emp_id, 1, '23:00', '01:30')
+
+    on_next_day = client.get('/api/tables/available?date=2030-01-02&partySize=2').get_json()['tables']
+    assert 1 not in [table['id'] for table in on_next_day]
+    status = client.get('/api/tables?date=2030-01-02').get_json()['tables']
+    assert status[0]['status'] == 'reserved'
+    assert book_slot(client, emp_id, 1, reservation_date='2030-01-02').status_code == 409
+    on_day_after = client.get('/api/tables/available?date=2030-01-03&partySize=2').get_json()['tables']
+    assert 1 in [table['id'] for table in on_day_after]
+
+
+def test_available_tables_at_a_time(client, emp_id):
+    book_slot(client, emp_id, 1, '19:00', '21:00')
+    book_slot(client, emp_id, 2, '12:00')
+
+    at_dinner = client.get('/api/tables/available?date=2030-01-01&partySize=2&time=19:30').get_json()
+    assert at_dinner['time'] == '19:30'
+    assert [table['id'] for table in at_dinner['tables']][:3] == [2, 3, 4]
+    assert at_dinner['tables'][0]['endTime'] == '2030-01-01 21:00'
+    # Standard tables turn in 90 minutes, so a 17:30 sitting at table 1 ends as the booking starts
+    early = client.get('/api/tables/available?date=2030-01-01&partySize=2&time=17:30').get_json()
+    assert [table['id'] for table in early['tables']][:3] == [1, 2, 3]
+    # Without a time, a table is only listed when free all day
+    all_day = client.get('/api/tables/available?date=2030-01-01&partySize=2').get_json()
+    assert [table['id'] for table in all_day['tables']][:2] == [3, 4]
+
+    assert client.get('/api/tables/available?date=2030-01-01&partySize=2&time=noon').status_code == 400
+
+
+def row_counts(database, *tables):
+    conn = sqlite3.connect(database)
+    counts = [conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0] for table in tables]
+    conn.close()
+    return counts
+
+
+def test_conflict_writes_no_payment(client, emp_id, pool):
+    assert book_slot(client, emp_id, 5, '19:00').status_code == 201
+    before = row_counts(pool.database, 'customer', 'payment', 'reservation')
+    assert book_slot(client, emp_id, 5, '20:00').status_code == 409
+    assert row_counts(pool.database, 'customer', 'payment', 'reservation') == before
+
+
+def test_slot_triggers_guard_direct_writes(client, emp_id, pool):
+    book_slot(client, emp_id, 6, '19:00', '21:00')
+    conn = sqlite3.connect(pool.database)
+    insert = ('INSERT INTO reservation (CustomerID, TableID, reservation_date, start_time, end_time) '
+              "VALUES (1, 6, '2030-01-01', ?, ?)")
+    with pytest.raises(sqlite3.IntegrityError, match='overlaps'):
+        conn.execute(insert, ('2030-01-01 20:00', '2030-01-01 22:00'))
+    with pytest.raises(sqlite3.IntegrityError, match='Invalid reservation slot'):
+        conn.execute(insert, ('2030-01-01 10:00', '2030-01-02 11:00'))
+    conn.execute(insert, ('2030-01-01 21:00', '2030-01-01 22:00'))
+    with pytest.raises(sqlite3.IntegrityError, match='overlaps'):
+        conn.execute("UPDATE reservation SET start_time = '2030-01-01 20:30' WHERE start_time = '2030-01-01 21:00'")
+    conn.close()
+
+
+def test_concurrent_bookings_never_overlap(pool, emp_id, monkeypatch):
+    busy = app_module.ConnectionPool(pool.database, max_size=16, timeout=10)
+    monkeypatch.setattr(app_module, 'db_pool', busy)
+    slots = [('18:00', '20:00'), ('19:00', '21:00'), ('20:00', '22:00'), (None, None)]
+    barrier = threading.Barrier(16)
+    statuses = []
+
+    def terminal(n):
+        client = app_module.app.test_client()
+        barrier.wait()
+        for i in range(8):
+            start_time, end_time = slots[(n + i) % len(slots)]
+            statuses.append(book_slot(client, emp_id, 1 + i % 2, start_time, end_time).status_code)
+
+    threads = [threading.Thread(target=terminal, args=(n,)) for n in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    busy.close_all()
+
+    assert len(statuses) == 128
+    assert set(statuses) <= {201, 409}
+    conn = sqlite3.connect(pool.database)
+    overlapping = conn.execute('''
+        SELECT COUNT(*) FROM reservation a
+        JOIN reservation b ON a.TableID = b.TableID AND a.ReservationID < b.ReservationID
+        WHERE a.start_time < b.end_time AND b.start_time < a.end_time
+    ''').fetchone()[0]
+    conn.close()
+    assert overlapping == 0
+    # No payment or customer is left behind by a rejected booking
+    assert row_counts(pool.database, 'reservation', 'payment') == [statuses.count(201)] * 2
+
+
+# ==================== TABLE STATUS ====================
+
+def test_tables_lists_each_table_once_for_the_date(client, emp_id):
+    lunch = book_slot(client, emp_id, 1, '12:00').get_json()['reservation']['reservationId']
+    book_slot(client, emp_id, 1, '19:00')
+    for day in ['2029-12-30', '2030-01-02', '2030-01-03']:
+        book_slot(client, emp_id, 2, reservation_date=day)
+
+    body = client.get('/api/tables?date=2030-01-01').get_json()
+    assert body['date'] == '2030-01-01'
+    assert [table['id'] for table in body['tables']] == list(range(1, 13))
+    assert body['tables'][0]['status'] == 'reserved'
+    assert body['tables'][0]['reservationId'] == lunch
+    assert all(table['status'] == 'available' for table in body['tables'][1:])
+
+    on_third = client.get('/api/tables?date=2030-01-03').get_json()['tables']
+    assert [table['id'] for table in on_third if table['status'] == 'reserved'] == [2]
+
+
+def test_tables_default_to_today(client, emp_id):
+    today = date.today().isoformat()
+    book_slot(client, emp_id, 4, reservation_date=today)
+    body = client.get('/api/tables').get_json()
+    assert body['date'] == today
+    assert [table['id'] for table in body['tables'] if table['status'] == 'reserved'] == [4]
+
+
+def test_tables_etag_is_scoped_to_the_date(client, emp_id):
+    today = client.get('/api/tables').headers['ETag']
+    assert today.endswith(f'-{date.today().isoformat()}"')
+    first = client.get('/api/tables?date=2030-01-01').headers['ETag']
+    assert first != today
+    assert client.get('/api/tables?date=2030-01-01', headers={'If-None-Match': first}).status_code == 304
+    assert client.get('/api/tables?date=2030-01-02', headers={'If-None-Match': first}).status_code == 200
+
+
+def test_tables_rejects_bad_date(client):
+    response = client.get('/api/tables?date=01/01/2030')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_table_status_never_scans_reservations(pool):
+    conn = pool.acquire()
+    plan = [row['detail'] for row in conn.execute(
+        f'EXPLAIN QUERY PLAN {app_module.TABLE_STATUS_QUERY}',
+        ('2029-12-31 00:00', '2030-01-02 00:00', '2030-01-01 00:00')
+    )]
+    conn.close()
+    reservation_steps = [step for step in plan if ' reservation ' in f'{step} ' or ' r ' in f'{step} ']
+    assert reservation_steps
+    assert all(step.startswith('SEARCH') for step in reservation_steps)
+
+
+# ==================== RESERVATION IMPORT ====================
+
+IMPORT_HEADER = 'tableId,customerName,phone,reservationDate,startTime,endTime,partySize,paymentMethod,paymentAmount\n'
+
+
+def import_csv(client, body, query=''):
+    return client.post(f'/api/reservations/import{query}', data=body.encode(), content_type='text/csv')
+
+
+def test_import_reports_each_rejected_row(client, emp_id, pool):
+    book_slot(client, emp_id, 1, '19:00', '21:00')
+    before = row_counts(pool.database, 'customer', 'payment', 'reservation')
+    response = import_csv(client, IMPORT_HEADER + (
+        '2,Ana,555-0001,2030-01-01,19:00,,2,cash,40\n'          # line 2: imported, with payment
+        '1,Ben,,2030-01-01,20:00,22:00,2,,\n'                   # line 3: overlaps the booking above
+        '2,Cal,,2030-01-01,20:00,,2,,\n'                        # line 4: overlaps line 2
+        '3,Dee,,2030-01-01,,,6,,\n'                             # line 5: table 3 seats 4
+        '99,Eve,,2030-01-01,,,2,,\n'                            # line 6: no such table
+        '4,Fay,,01/01/2030,,,2,,\n'                             # line 7: bad date
+        '4,,,2030-01-01,,,2,,\n'                                # line 8: no name
+        '4,Gus,,2030-01-01,12:00,,2,cheque,10\n'                # line 9: bad payment method
+        '5,"Hal, party of 6",,2030-01-01,23:00,01:00,6,,\n'     # line 10: imported, runs past midnight
+        '5,Ivy,,2030-01-02,00:30,,2,,\n'                        # line 11: overlaps line 10
+    ), query=f'?empId={emp_id}')
+    assert response.status_code == 207
+    body = response.get_json()
+    assert (body['imported'], body['failed'], body['errorsTruncated']) == (2, 8, False)
+    assert [error['line'] for error in body['errors']] == [5, 6, 7, 8, 9, 3, 4, 11]
+    assert body['errors'][0]['error'].startswith('Party size (6) exceeds table capacity (4)')
+
+    customers, payments, reservations = row_counts(pool.database, 'customer', 'payment', 'reservation')
+    assert (customers, payments, reservations) == (before[0] + 2, before[1] + 1, before[2] + 2)
+    grid = client.get('/api/tables/grid?date=2030-01-01').get_json()['tables']
+    assert grid[1]['slots'][0]['startTime'] == '2030-01-01 19:00'
+    assert grid[1]['slots'][0]['endTime'] == '2030-01-01 20:30'
+    assert grid[4]['slots'][0]['customerName'] == 'Hal, party of 6'
+
+
+def test_import_checks_conflicts_across_chunks(client, emp_id, pool):
+    rows = ''.join(f'{1 + n % 3},Guest {n},,2030-02-0{1 + n // 3},18:00,,2,,\n' for n in range(9))
+    rows += '2,Late,,2030-02-02,18:30,,2,,\n'  # clashes with a row from an earlier chunk
+    response = import_csv(client, IMPORT_HEADER + rows, query='?chunkSize=4')
+    body = response.get_json()
+    assert response.status_code == 207
+    assert (body['imported'], body['failed']) == (9, 1)
+    assert body['errors'] == [{'line': 11, 'error': 'This table is already reserved for the selected time'}]
+
+    all_valid = import_csv(client, IMPORT_HEADER + '1,Kim,,2030-03-01,,,2,,\n')
+    assert all_valid.status_code == 201
+    assert all_valid.get_json()['success'] is True
+
+
+def test_import_accepts_a_file_upload(client, emp_id):
+    response = client.post(f'/api/reservations/import?empId={emp_id}', data={
+        'file': (io.BytesIO(('\ufeff' + IMPORT_HEADER + '1,Lee,,2030-04-01,19:00,,2,,\n').encode()), 'bookings.csv'),
+    })
+    assert response.status_code == 201
+    assert response.get_json()['imported'] == 1
+
+
+@pytest.mark.parametrize('body, query', [
+    ('tableId,customerName\n1,Ann\n', ''),
+    (IMPORT_HEADER, '?chunkSize=0'),
+])
+def test_import_rejects_bad_requests(client, body, query):
+    response = import_csv(client, body, query)
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_import_memory_does_not_grow_with_file_size(emp_id):
+    import_reservations = pytest.importorskip('import_reservations')
+
+    def peak_memory(rows, first_day):
+        def lines():
+            yield IMPORT_HEADER
+            for n in range(rows):
+                day = date.fromordinal(first_day.toordinal() + n // 24)
+                yield f'{1 + n % 12},Guest {n},,{day.isoformat()},{10 + n % 24 // 12 * 6}:00,,2,,\n'
+        errors = io.StringIO()
+        tracemalloc.start()
+        result = import_reservations.import_file(lines(), emp_id, 100, csv.writer(errors))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        assert (result.imported, result.failed) == (rows, 0)
+        return peak
+
+    small = peak_memory(500, date(2031, 1, 1))
+    large = peak_memory(4000, date(2032, 1, 1))
+    assert large < small * 1.5
+
+
+# ==================== ETAGS ====================
+
+@pytest.mark.parametrize('path', ['/api/menu', '/api/menu/categories', '/api/tables', '/api/reviews'])
+def test_matching_etag_answers_304_without_running_view(client, monkeypatch, path):
+    first = client.get(path)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+
+    statements = count_queries(monkeypatch)
+    second = client.get(path, headers={'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.data == b''
+    assert second.headers['ETag'] == etag
+    assert len(statements) == 1  # only the table_version lookup
+
+
+def test_etag_changes_when_table_changes(client):
+    etag = client.get('/api/reviews').headers['ETag']
+    client.post('/api/reviews', json={'name': 'Guest', 'rating': 5, 'comment': 'Great'})
+
+    response = client.get('/api/reviews', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert len(response.get_json()['reviews']) == 1
+
+
+# ==================== COMPRESSION ====================
+
+@pytest.mark.parametrize('coding', ['gzip', 'br'])
+def test_large_response_is_compressed(client, emp_id, coding):
+    decompress = pytest.importorskip('brotli').decompress if coding == 'br' else gzip.decompress
+    create_orders(client, emp_id, 20)
+
+    plain = client.get('/api/orders')
+    assert 'Content-Encoding' not in plain.headers
+    assert len(plain.data) >= app_module.COMPRESS_MIN_SIZE
+
+    response = client.get('/api/orders', headers={'Accept-Encoding': coding})
+    assert response.headers['Content-Encoding'] == coding
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert 'Content-Length' not in response.headers
+    assert decompress(response.data) == plain.data
+
+
+def test_client_preference_decides_encoding(client, emp_id):
+    create_orders(client, emp_id, 20)
+    response = client.get('/api/orders', headers={'Accept-Encoding': 'br;q=0.5, gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+
+def test_small_response_is_not_compressed(client):
+    response = client.get('/api/reviews', headers={'Accept-Encoding': 'gzip, br'})
+    assert len(response.data) < app_module.COMPRESS_MIN_SIZE
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+def test_compression_streams_in_chunks(client, emp_id, monkeypatch):
+    monkeypatch.setattr(app_module, 'COMPRESS_CHUNK_SIZE', 256)
+    create_orders(client, emp_id, 20)
+
+    response = client.get('/api/orders', headers={'Accept-Encoding': 'gzip'}, buffered=False)
+    assert response.is_streamed
+    chunks = list(response.response)
+    assert len(chunks) > 1
+    assert gzip.decompress(b''.join(chunks)) == client.get('/api/orders').data
+
+
+def test_compressed_etag_revalidates(client):
+    identity = client.get('/api/menu')
+    response = client.get('/api/menu', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    etag = response.headers['ETag']
+    assert etag == identity.headers['ETag'][:-1] + '-gzip"'
+
+    second = client.get('/api/menu', headers={'Accept-Encoding': 'gzip', 'If-None-Match': etag})
+    assert second.status_code == 304
+    assert second.headers['ETag'] == etag
+
+
+# ==================== SQL INSTRUMENTATION ====================
+
+def test_query_headers_only_in_debug(client, emp_id, monkeypatch):
+    create_orders(client, emp_id, 3)
+    assert 'X-Query-Count' not in client.get('/api/orders').headers
+
+    monkeypatch.setattr(app_module.app, 'debug', True)
+    response = client.get('/api/orders')
+    assert int(response.headers['X-Query-Count']) == 2  # orders, then their items in one batch
+    assert float(response.headers['X-Query-Time-Ms']) >= 0
+
+
+def test_slow_query_log_redacts_parameters(client, monkeypatch, caplog):
+    monkeypatch.setattr(app_module, 'SLOW_QUERY_MS', 0)
+    client.post('/api/auth/signin', json={'email': 'secret@restaurant.com', 'password': 'hunter2'})
+
+    slow = [record.getMessage() for record in caplog.records if record.getMessage().startswith('Slow query')]
+    assert any('FROM employee' in message and 'params=(str)' in message for message in slow)
+    assert not any('secret@restaurant.com' in message or 'hunter2' in message for message in slow)
+
+
+def test_statement_shape_replaces_literals():
+    shape = app_module.statement_shape(
+        "SELECT *  FROM employee\n WHERE role = 'admin' AND EmpID IN (?, ?, ?) LIMIT 10"
+    )
+    assert shape == 'SELECT * FROM employee WHERE role = ? AND EmpID IN (?, ...) LIMIT ?'
+
+
+def test_repeated_statement_is_flagged_as_n_plus_one(client, emp_id, monkeypatch, caplog):
+    create_orders(client, emp_id, 4)
+    monkeypatch.setattr(app_module, 'N_PLUS_ONE_THRESHOLD', 3)
+
+    def get_orders_per_order_query():
+        conn = app_module.get_db_connection()
+        for order in conn.execute('SELECT OrderID FROM orders').fetchall():
+            conn.execute('SELECT * FROM order_item WHERE OrderID = ?', (order['OrderID'],)).fetchall()
+        conn.close()
+        return app_module.jsonify({'success': True})
+    monkeypatch.setitem(app_module.app.view_functions, 'get_orders', get_orders_per_order_query)
+
+    client.get('/api/orders')
+    flagged = [record.getMessage() for record in caplog.records if 'N+1' in record.getMessage()]
+    assert flagged == [
+        'Likely N+1 query in GET /api/orders: ran 4 times: SELECT * FROM order_item WHERE OrderID = ?'
+    ]
+
+    caplog.clear()
+    client.get('/api/menu')
+    assert not [record for record in caplog.records if 'N+1' in record.getMessage()]
+
+
+# ==================== METRICS ====================
+
+@pytest.fixture
+def metrics(monkeypatch):
+    metrics = app_module.RequestMetrics()
+    monkeypatch.setattr(app_module, 'request_metrics', metrics)
+    return metrics
+
+
+def metric_value(text, line_prefix):
+    """Value of the single exposition line starting with line_prefix"""
+    values = [line.rsplit(' ', 1)[1] for line in text.splitlines() if line.startswith(line_prefix)]
+    assert len(values) == 1, values
+    return float(values[0])
+
+
+def test_metrics_record_latency_by_route_method_and_status(client, metrics):
+    for _ in range(3):
+        client.get('/api/menu')
+    client.get('/api/orders/999')
+    client.get('/no/such/path')
+
+    text = client.get('/api/metrics').get_data(as_text=True)
+    assert '# TYPE rms_http_request_duration_seconds histogram' in text
+    menu = 'route="/api/menu",method="GET",status="200"'
+    assert metric_value(text, f'rms_http_request_duration_seconds_count{{{menu}}}') == 3
+    assert metric_value(text, f'rms_http_request_duration_seconds_bucket{{{menu},le="+Inf"}}') == 3
+    assert metric_value(text, f'rms_http_request_duration_seconds_sum{{{menu}}}') > 0
+    assert metric_value(
+        text, 'rms_http_request_duration_seconds_count{route="/api/orders/<int:order_id>",method="GET",status="404"}'
+    ) == 1
+    assert 'route="unmatched",method="GET",status="404"' in text
+
+
+def test_metrics_record_response_size_before_compression(client, metrics):
+    plain = client.get('/api/menu')
+    client.get('/api/menu', headers={'Accept-Encoding': 'gzip'})
+
+    text = client.get('/api/metrics').get_data(as_text=True)
+    labels = 'route="/api/menu",method="GET",status="200"'
+    assert metric_value(text, f'rms_http_response_size_bytes_count{{{labels}}}') == 2
+    assert metric_value(text, f'rms_http_response_size_bytes_sum{{{labels}}}') == 2 * len(plain.data)
+
+
+def test_metrics_buckets_are_cumulative(metrics):
+    metrics.start('/r', 'GET')
+    metrics.finish('/r', 'GET', 200, 0.003, 100)
+    metrics.start('/r', 'GET')
+    metrics.finish('/r', 'GET', 200, 0.2, 5000)
+
+    text = metrics.render()
+    labels = 'route="/r",method="GET",status="200"'
+    assert metric_value(text, f'rms_http_request_duration_seconds_bucket{{{labels},le="0.005"}}') == 1
+    assert metric_value(text, f'rms_http_request_duration_seconds_bucket{{{labels},le="0.1"}}') == 1
+    assert metric_value(text, f'rms_http_request_duration_seconds_bucket{{{labels},le="0.25"}}') == 2
+    assert metric_value(text, f'rms_http_response_size_bytes_bucket{{{labels},le="4096"}}') == 1
+
+
+def test_metrics_in_flight_returns_to_zero_after_error(client, metrics, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError('boom')
+    monkeypatch.setitem(app_module.app.view_functions, 'get_menu', broken)
+
+    with pytest.raises(RuntimeError):
+        client.get('/api/menu')
+
+    text = metrics.render()
+    assert metric_value(text, 'rms_http_requests_in_flight{route="/api/menu",method="GET"}') == 0
+    assert metric_value(
+        text, 'rms_http_request_duration_seconds_count{route="/api/menu",method="GET",status="500"}'
+    ) == 1
+
+
+# ==================== JSON PROVIDER ====================
+
+JSON_PROVIDER_NAMES = ['stdlib', pytest.param('orjson', marks=pytest.mark.skipif(
+    app_module.orjson is None, reason='orjson not installed'))]
+
+
+@pytest.mark.parametrize('name', JSON_PROVIDER_NAMES)
+def test_json_provider_encodes_rows_decimals_and_dates(pool, name):
+    provider = app_module.JSON_PROVIDERS[name](app_module.app)
+    conn = pool.acquire()
+    row = conn.execute('SELECT ItemID, name FROM menu WHERE ItemID = 1').fetchone()
+    conn.close()
+
+    payload = {
+        'item': row,
+        'price': Decimal('12.10'),
+        'date': date(2025, 1, 2),
+        'at': datetime(2025, 1, 2, 13, 30),
+    }
+    with app_module.app.app_context():
+        body = provider.response(payload).get_data()
+    assert json.loads(body) == {
+        'item': {'ItemID': 1, 'name': row['name']},
+        'price': '12.10',
+        'date': 'Thu, 02 Jan 2025 00:00:00 GMT',
+        'at': 'Thu, 02 Jan 2025 13:30:00 GMT',
+    }
+
+
+@pytest.mark.parametrize('name', JSON_PROVIDER_NAMES)
+def test_json_provider_encodes_dates_like_flask_default(name):
+    payload = {'date': date(2025, 1, 2), 'at': datetime(2025, 1, 2, 13, 30), 'price': Decimal('12.10')}
+    with app_module.app.app_context():
+        body = app_module.JSON_PROVIDERS[name](app_module.app).response(payload).get_data()
+        default = DefaultJSONProvider(app_module.app).response(payload).get_data()
+    assert body == default
+
+
+def test_json_provider_without_orjson_falls_back_to_stdlib(tmp_path):
+    backend = os.path.dirname(os.path.abspath(__file__))
+    script = (
+        "import sys\n"
+        "sys.modules['orjson'] = None\n"
+        "from datetime import datetime\n"
+        "import app\n"
+        "print(app.JSON_PROVIDER, sorted(app.JSON_PROVIDERS))\n"
+        "with app.app.app_context():\n"
+        "    print(app.app.json.dumps({'at': datetime(2025, 1, 2, 13, 30)}))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=backend)
+    env.pop('JSON_PROVIDER', None)
+    result = subprocess.run([sys.executable, '-c', script], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.splitlines() == [
+        "stdlib ['stdlib']",
+        '{"at": "Thu, 02 Jan 2025 13:30:00 GMT"}',
+    ]
+
+
+@pytest.mark.parametrize('name', JSON_PROVIDER_NAMES)
+def test_json_provider_output_matches_stdlib(client, emp_id, name):
+    create_orders(client, emp_id, 5)
+    conn = app_module.get_db_connection()
+    payload = app_module.read_orders(conn, {})
+    conn.close()
+
+    with app_module.app.app_context():
+        body = app_module.JSON_PROVIDERS[name](app_module.app).response(payload).get_data()
+    assert body == client.get('/api/orders').data
+    assert body == (json.dumps(payload, sort_keys=True, separators=(',', ':')) + '\n').encode()
+
+
+# ==================== BENCHMARK SUITE ====================
+
+@pytest.mark.parametrize('scenario', ['create_order', 'create_bill', 'make_reservation', 'get_tables'])
+def test_benchmark_scenarios_run(pool, scenario):
+    benchmark_api = pytest.importorskip('benchmark_api')
+    stats = benchmark_api.run_scenario(scenario, order_count=30, iterations=5, warmup=1)
+    assert stats['iterations'] == 5
+    assert 0 < stats['p50_ms'] <= stats['p95_ms'] <= stats['p99_ms']
+    assert stats['throughput_rps'] > 0
+
+
+def test_benchmark_compare_flags_regressions():
+    benchmark_api = pytest.importorskip('benchmark_api')
+    baseline = {'results': {'get_orders': {'p50_ms': 10.0, 'p95_ms': 20.0},
+                            'get_bills': {'p50_ms': 10.0, 'p95_ms': 20.0}}}
+    current = {'results': {'get_orders': {'p50_ms': 10.5, 'p95_ms': 25.0},
+                           'get_bills': {'p50_ms': 9.0, 'p95_ms': 21.0},
+                           'get_stats': {'p50_ms': 1.0, 'p95_ms': 2.0}}}
+    assert benchmark_api.compare(current, baseline, tolerance=0.10) == ['get_orders']
+
+
+# ==================== DATA GENERATOR ====================
+
+def generated_rows(database):
+    conn = sqlite3.connect(database)
+    rows = {
+        table: conn.execute(f'SELECT * FROM {table} ORDER BY 1, 2').fetchall()
+        for table in ['orders', 'order_item', 'bill', 'reservation', 'payment', 'review']
+    }
+    # created_at of the default tables is the time init_database() ran
+    rows['restaurant_table'] = conn.execute('SELECT TableID, category, price, capacity FROM restaurant_table').fetchall()
+    conn.close()
+    return rows
+
+
+def test_generator_is_deterministic_and_consistent(pool, client, tmp_path, monkeypatch):
+    generate_data = pytest.importorskip('generate_data')
+    counts = generate_data.generate(scale=0.002, seed=7, log=lambda message: None)
+    assert counts['orders'] == 2000
+    assert counts['reservation'] == 400
+    assert counts['review'] == 200
+
+    # Same seed, fresh database: identical rows
+    other = app_module.ConnectionPool(str(tmp_path / 'other.db'))
+    monkeypatch.setattr(app_module, 'db_pool', other)
+    app_module.init_database()
+    generate_data.generate(scale=0.002, seed=7, log=lambda message: None)
+    assert generated_rows(other.database) == generated_rows(pool.database)
+    other.close_all()
+    monkeypatch.setattr(app_module, 'db_pool', pool)
+
+    conn = sqlite3.connect(pool.database)
+    # Every bill matches its order's items, and no table is booked twice on a day
+    assert conn.execute('''
+        SELECT COUNT(*) FROM bill b
+        WHERE abs(b.amount - (SELECT SUM(oi.quantity * m.price) FROM order_item oi
+                              JOIN menu m ON m.ItemID = oi.ItemID WHERE oi.OrderID = b.OrderID)) > 0.005
+    ''').fetchone()[0] == 0
+    assert conn.execute(
+        'SELECT COUNT(*) FROM (SELECT 1 FROM reservation GROUP BY TableID, reservation_date HAVING COUNT(*) > 1)'
+    ).fetchone()[0] == 0
+    assert conn.execute(
+        'SELECT COUNT(*) FROM reservation WHERE start_time IS NULL OR end_time <= start_time'
+    ).fetchone()[0] == 0
+    conn.close()
+
+    # Indexes, triggers and derived statistics are back in place
+    stats = client.get('/api/stats').get_json()
+    assert stats['stats']['total_reviews'] == 200
+    conn = sqlite3.connect(pool.database)
+    conn.row_factory = sqlite3.Row
+    assert app_module.check_hot_query_plans(conn) == []
+    conn.close()
+    client.post('/api/reviews', json={'name': 'Guest', 'rating': 5, 'comment': 'Great'})
+    assert client.get('/api/stats').get_json()['stats']['total_reviews'] == 201
+
+
+# ==================== ASYNC READ PATH ====================
+
+async def asgi_get(asgi_app, path, query=''):
+    """Minimal ASGI client: (status, body) for a GET request"""
+    messages = []
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+        'method': 'GET', 'scheme': 'http', 'path': path, 'raw_path': path.encode(),
+        'root_path': '', 'query_string': query.encode(), 'headers': [],
+        'client': ('testclient', 1), 'server': ('testserver', 80),
+    }
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi_app(scope, receive, send)
+    return messages[0]['status'], b''.join(message.get('body', b'') for message in messages[1:])
+
+
+@pytest.mark.parametrize('path,query', [
+    ('/api/menu', ''),
+    ('/api/menu/categories', ''),
+    ('/api/tables', ''),
+    ('/api/tables/available', 'date=2030-01-01&partySize=3'),
+    ('/api/tables/available', 'date=bad&partySize=3'),
+    ('/api/tables/grid', 'date=2030-01-01'),
+    ('/api/orders', ''),
+    ('/api/orders', 'limit=2'),
+    ('/api/bills', ''),
+    ('/api/reservations', ''),
+    ('/api/reviews', ''),
+    ('/api/orders', 'limit=0'),
+])
+def test_async_read_path_matches_flask(client, emp_id, path, query):
+    async_app = pytest.importorskip('async_app')
+    create_orders(client, emp_id, 3)
+    client.post('/api/bills', json={'orderId': 2, 'paymentMethod': 'cash'})
+    client.post('/api/reviews', json={'name': 'Guest', 'rating': 4, 'comment': 'Good'})
+
+    expected = client.get(f'{path}?{query}')
+    status, body = asyncio.run(asgi_get(async_app.app, path, query))
+    assert status == expected.status_code
+    assert body == expected.data
+
+
+def test_async_read_path_serves_concurrent_clients(client, emp_id, pool):
+    async_app = pytest.importorskip('async_app')
+    create_orders(client, emp_id, 10)
+
+    async def many():
+        return await asyncio.gather(*[asgi_get(async_app.app, '/api/orders') for _ in range(50)])
+
+    results = asyncio.run(many())
+    assert {status for status, _ in results} == {200}
+    assert len({body for _, body in results}) == 1
+    assert pool.stats()['inUse'] == 0
+
+
+class SSEStream:
+    """Drives a streaming ASGI GET; blocks are read as they are sent"""
+
+    def __init__(self, asgi_app, path):
+        self.asgi_app = asgi_app
+        self.path = path
+        self.chunks = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self.buffer = ''
+        self.status = None
+
+    async def open(self):
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': 'GET', 'scheme': 'http', 'path': self.path, 'raw_path': self.path.encode(),
+            'root_path': '', 'query_string': b'', 'headers': [(b'accept-encoding', b'gzip')],
+            'client': ('testclient', 1), 'server': ('testserver', 80),
+        }
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+            await self.disconnected.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                self.status = message['status']
+                self.headers = dict(message['headers'])
+            else:
+                await self.chunks.put(message.get('body', b'').decode())
+
+        self.task = asyncio.create_task(self.asgi_app(scope, receive, send))
+
+    async def next_block(self, timeout=5):
+        while '\n\n' not in self.buffer:
+            self.buffer += await asyncio.wait_for(self.chunks.get(), timeout)
+        block, self.buffer = self.buffer.split('\n\n', 1)
+        return block
+
+    async def next_event(self, timeout=5):
+        """(event name, decoded data) of the next event, skipping heartbeats"""
+        while True:
+            block = await self.next_block(timeout)
+            fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+            if 'event' in fields:
+                return fields['event'], json.loads(fields['data'])
+
+    async def close(self):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, 5)
+
+
+@pytest.fixture
+def async_app(pool, monkeypatch):
+    async_app = pytest.importorskip('async_app')
+    monkeypatch.setattr(async_app, 'broadcaster', async_app.TableStatusBroadcaster())
+    monkeypatch.setattr(async_app, 'SSE_POLL_INTERVAL', 0.01)
+    return async_app
+
+
+def test_table_stream_pushes_reservation_commits(client, emp_id, async_app):
+    writer = app_module.app.test_client()  # used from a worker thread, so no preserved context
+
+    async def scenario():
+        stream = SSEStream(async_app.app, '/api/tables/stream')
+        await stream.open()
+        event, snapshot = await stream.next_event()
+        assert stream.status == 200
+        assert stream.headers[b'content-type'].startswith(b'text/event-stream')
+        assert b'content-encoding' not in stream.headers
+
+        booked = await asyncio.to_thread(writer.post, '/api/reservations', json={
+            'tableId': 3, 'customerName': 'Stream Guest', 'reservationDate': date.today().isoformat(),
+            'partySize': 2, 'paymentMethod': 'cash', 'paymentAmount': 20, 'empId': emp_id,
+        })
+        reservation_id = booked.get_json()['reservation']['reservationId']
+        booked_event = await stream.next_event()
+
+        await asyncio.to_thread(writer.delete, f'/api/reservations/{reservation_id}')
+        cancelled_event = await stream.next_event()
+        await stream.close()
+        return event, snapshot, booked_event, cancelled_event
+
+    event, snapshot, (booked_name, booked), (cancelled_name, cancelled) = asyncio.run(scenario())
+    assert event == 'snapshot'
+    assert snapshot['tables'] == client.get('/api/tables').get_json()['tables']
+
+    assert booked_name == 'update'
+    assert [(table['id'], table['status'], table['customerName']) for table in booked['tables']] == \
+        [(3, 'reserved', 'Stream Guest')]
+    assert cancelled_name == 'update'
+    assert [(table['id'], table['status']) for table in cancelled['tables']] == [(3, 'available')]
+    assert async_app.broadcaster.subscribers == set()
+
+
+def test_table_stream_sends_heartbeats(async_app, monkeypatch):
+    monkeypatch.setattr(async_app, 'SSE_HEARTBEAT_SECONDS', 0.05)
+
+    async def scenario():
+        stream = SSEStream(async_app.app, '/api/tables/stream')
+        await stream.open()
+        await stream.next_event()
+        block = await stream.next_block()
+        await stream.close()
+        return block
+
+    assert asyncio.run(scenario()) == ': heartbeat'
+
+
+def test_idle_table_streams_share_one_poller_without_threads(async_app):
+    async def scenario():
+        threads_before = threading.active_count()
+        streams = [SSEStream(async_app.app, '/api/tables/stream') for _ in range(200)]
+        for stream in streams:
+            await stream.open()
+        for stream in streams:
+            await stream.next_event()
+        subscribed = len(async_app.broadcaster.subscribers)
+        extra_threads = threading.active_count() - threads_before
+        for stream in streams:
+            await stream.close()
+        await asyncio.sleep(0.05)
+        return subscribed, extra_threads
+
+    subscribed, extra_threads = asyncio.run(scenario())
+    assert subscribed == 200
+    assert extra_threads <= async_app.ASYNC_DB_WORKERS
+    assert async_app.broadcaster.subscribers == set()
+    assert async_app.broadcaster.task is None
@@ -0,0 +1,10 @@
+"""
+WSGI entry point for production servers
+    gunicorn -c gunicorn.conf.py wsgi:app          (Linux/macOS)
+    waitress-serve --port=5000 --threads=8 wsgi:app (Windows)
+The database is initialized by the server's master process (see gunicorn.conf.py),
+not here, so it runs once per deployment instead of once per worker
+"""
+from app import app
+
+__all__ = ['app']
@@ -4,4 +4,6 @@ cd backend
 echo Installing required packages...
 pip install -r requirements.txt
 echo Starting server...
-python app.py
\ No newline at end of file
+REM Initialize the database once, then serve with a multi-threaded WSGI server
+python -c "import app; app.init_database()"
+waitress-serve --host=0.0.0.0 --port=5000 --threads=8 wsgi:app
\ No newline at end of file
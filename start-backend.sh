@@ -4,4 +4,6 @@ cd backend
 echo "Installing required packages..."
 pip install -r requirements.txt
 echo "Starting server..."
-python app.py
\ No newline at end of file
+# Multi-worker production server; the database is initialized once by the master.
+# Graceful reload: kill -HUP <master pid>. Development server: python app.py
+exec gunicorn -c gunicorn.conf.py wsgi:app